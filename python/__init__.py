@@ -2,17 +2,43 @@
 wp_chariot
 ==========
 
-Spin up idempotent WordPress dev envs with one click. Sync your changes both ways conveniently. 
+Spin up idempotent WordPress dev envs with one click. Sync your changes both ways conveniently.
 Only SSH required on your server, and only DDEV and Python required on your local machine.
 """
 
+import importlib
+
 __version__ = "0.1.0"
 __author__ = "Victor Gonzalez"
 __email__ = "victor@ttamayo.com"
 
 from .config_yaml import get_yaml_config
-from .commands.sync import sync_files
-from .commands.diff import show_diff
-from .commands.database import sync_database
-from .commands.patch import list_patches, apply_patch, rollback_patch, add_patch, remove_patch
-from .commands.media import configure_media_path 
\ No newline at end of file
+
+# Command functions are imported on first access (PEP 562) so that importing
+# the package does not load every command module and its dependencies
+_LAZY_EXPORTS = {
+    "sync_files": ".commands.sync",
+    "show_diff": ".commands.diff",
+    "sync_database": ".commands.database",
+    "list_patches": ".commands.patch",
+    "apply_patch": ".commands.patch",
+    "rollback_patch": ".commands.patch",
+    "add_patch": ".commands.patch",
+    "remove_patch": ".commands.patch",
+    "configure_media_path": ".commands.media",
+}
+
+__all__ = ["get_yaml_config"] + list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache the symbol so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,23 +7,25 @@ This script provides a command-line interface for deployment tools.
 
 import os
 import sys
+import contextlib
+import functools
+import re
 import click
 from pathlib import Path
-import yaml
-
-# Ensure the wp_deploy package can be imported
-script_dir = Path(__file__).resolve().parent
-if script_dir not in sys.path:
-    sys.path.append(str(script_dir))
-
-# Import YAML configuration instead of previous .env based configuration
-from config_yaml import get_yaml_config
-from commands.sync import sync_files
-from commands.diff import show_diff
-from commands.database import sync_database
-from commands.patch import list_patches, apply_patch, rollback_patch, add_patch, remove_patch
-from commands.media import configure_media_path
-from commands.backup import create_full_backup
+from typing import List, Optional, Tuple
+
+# Import YAML configuration instead of previous .env based configuration.
+# The script directory is only added to sys.path when the modules can't be found
+try:
+    from config_yaml import get_yaml_config, SafeLoader, SafeDumper, CONFIG_SECTIONS, REQUIRED_SECTIONS
+except ImportError:
+    script_dir = os.environ.get("WP_DEPLOY_INSTALL_DIR") or Path(__file__).resolve().parent
+    sys.path.insert(0, str(script_dir))
+    from config_yaml import get_yaml_config, SafeLoader, SafeDumper, CONFIG_SECTIONS, REQUIRED_SECTIONS
+from utils.filesystem import batch_exists
+
+# Command modules (and their dependencies) are imported inside each command,
+# so that only the module of the selected command is loaded
 
 # Define a common option for site
 site_option = click.option(
@@ -31,6 +33,241 @@ site_option = click.option(
     help="Site alias to operate on (if multiple are configured)"
 )
 
+# Options shared by several commands
+dry_run_option = click.option("--dry-run", is_flag=True, help="Simulate operation without making changes")
+direction_option = click.option("--direction", type=click.Choice(['from-remote', 'to-remote']), 
+                                default='from-remote', help="Direction of synchronization")
+verbose_option = click.option("--verbose", "-v", is_flag=True, help="Show detailed information during execution")
+
+def _path_executables(names) -> set:
+    """
+    Finds which of the given tools are executables in PATH
+    
+    Each directory is read once, so checking several tools costs one
+    directory scan per PATH entry instead of one lookup per tool and entry.
+    Like shutil.which, only regular files the user can execute are counted
+    and on Windows the extensions in PATHEXT are tried (case-insensitively).
+    
+    Args:
+        names: Names of the tools to look for
+        
+    Returns:
+        set: Names of the tools found in PATH
+    """
+    wanted = set(names)
+    found = set()
+    
+    # File name (as compared) -> tool name
+    if os.name == "nt":
+        extensions = os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(os.pathsep)
+        candidates = {(name + ext).lower(): name
+                      for name in wanted for ext in [""] + extensions if ext or "." in name}
+    else:
+        candidates = {name: name for name in wanted}
+    
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if found == wanted:
+            break
+        if not directory:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = candidates.get(entry.name.lower() if os.name == "nt" else entry.name)
+                    if (name is not None and name not in found
+                            and entry.is_file() and os.access(entry.path, os.X_OK)):
+                        found.add(name)
+        except OSError:
+            continue
+    return found
+
+# Fields of 'ddev describe -j' (under "raw") shown by show-ddev-config
+DDEV_DESCRIBE_FIELDS = [
+    ("name", "Name"),
+    ("status", "Status"),
+    ("type", "Project type"),
+    ("primary_url", "Primary URL"),
+    ("httpsurl", "HTTPS URL"),
+    ("httpurl", "HTTP URL"),
+    ("php_version", "PHP version"),
+    ("docroot", "Docroot"),
+]
+
+# Non-empty lines containing ':' in the output of 'ddev describe' when it
+# is not the expected JSON (surrounding whitespace excluded)
+DDEV_FALLBACK_LINE = re.compile(rb"^[ \t]*([^\n]*:[^\n]*?)[ \t\r]*$", re.MULTILINE)
+
+def _ddev_describe(project_dir) -> Tuple[int, Optional[dict], List[str], str]:
+    """
+    Runs 'ddev describe -j' in the project directory
+    
+    The output is read as bytes while the command runs: JSON lines are
+    parsed directly from bytes, and the lines shown as a fallback are
+    picked out with a single regex pass and only then decoded.
+    
+    Args:
+        project_dir: DDEV project directory
+        
+    Returns:
+        Tuple[int, Optional[dict], List[str], str]: Exit code, the "raw" project
+        data (None if it can't be parsed), output lines containing ':' for an
+        unexpected format, standard error
+    """
+    import json
+    import subprocess
+    import tempfile
+    
+    describe = None
+    lines = []
+    
+    # stderr goes to a temporary file so it can't block the stdout pipe
+    with tempfile.TemporaryFile() as stderr_file:
+        with subprocess.Popen(
+            ["ddev", "describe", "-j"],
+            cwd=project_dir,  # Execute in project directory
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
+        ) as process:
+            for raw in process.stdout:
+                if describe is not None:
+                    continue
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    data = None
+                if isinstance(data, dict) and isinstance(data.get("raw"), dict):
+                    describe = data["raw"]
+                else:
+                    lines.append(raw)
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors="replace")
+    
+    if describe is not None:
+        return process.returncode, describe, [], stderr
+    matches = DDEV_FALLBACK_LINE.findall(b"".join(lines))
+    return process.returncode, describe, [line.decode(errors="replace") for line in matches], stderr
+
+@functools.lru_cache(maxsize=256)
+def _is_dir_cached(path) -> bool:
+    """
+    Checks if a path is a directory, remembering the answer for the process
+    
+    Missing paths are cached too, so every project directory is checked
+    with at most one stat call. Use _is_dir_cached.cache_clear() if the
+    filesystem may have changed.
+    
+    Args:
+        path: Path to inspect
+        
+    Returns:
+        bool: True if the path exists and is a directory
+    """
+    return os.path.isdir(path)
+
+def _require_ddev_config(config) -> Tuple[str, str, str, str]:
+    """
+    Reads the DDEV settings of the selected site, exiting if they are incomplete
+    
+    Args:
+        config: Configuration with a site already selected
+        
+    Returns:
+        Tuple[str, str, str, str]: base_path, docroot, WordPress path inside
+        the container and the DDEV project directory
+    """
+    try:
+        return config.get_ddev_paths()
+    except ValueError as e:
+        _die(f"❌ Error: {str(e)}")
+
+# Error messages shared by the DDEV diagnostic commands
+ERR_PROJECT_DIR_MISSING = "❌ Error: Project directory '{}' does not exist"
+ERR_WP_NOT_INSTALLED = "❌ WordPress is not installed or could not be detected"
+ERR_DDEV_NOT_RUNNING = (
+    "⚠️ DDEV project is not running (status: {})",
+    "   Start it with 'ddev start' and run this command again",
+)
+
+def _die(*lines: str):
+    """
+    Writes an error message to stderr and exits with an error code
+    
+    Args:
+        *lines: Lines of the message
+    """
+    click.echo("\n".join(lines), err=True)
+    sys.exit(1)
+
+class _Out:
+    """
+    Collects the output lines of a command and writes them with a single call
+    
+    A quiet instance drops the lines (used when the result is printed as JSON),
+    errors are still written to stderr.
+    """
+    
+    def __init__(self, quiet: bool = False):
+        self.lines = []
+        self.quiet = quiet
+    
+    def __call__(self, line: str = ""):
+        if not self.quiet:
+            self.lines.append(line)
+    
+    def flush(self):
+        """
+        Writes the pending lines, if any
+        """
+        if self.lines:
+            click.echo("\n".join(self.lines))
+            self.lines.clear()
+    
+    def die(self, *lines: str):
+        """
+        Writes the pending lines, then the error message to stderr, and exits
+        
+        Args:
+            *lines: Lines of the error message
+        """
+        self.flush()
+        _die(*lines)
+
+def _emit_json(data: dict):
+    """
+    Writes the result of a command to stdout as a single JSON document
+    
+    Args:
+        data: Result of the command
+    """
+    import json
+    click.echo(json.dumps(data, default=str))
+
+def _replace_file(path: Path, data: bytes, mode: Optional[int] = None):
+    """
+    Writes a file atomically through a temporary file in the same directory
+    
+    The temporary file is created readable only by the current user and gets
+    the given permissions before it replaces the file, so its content is
+    never exposed with broader permissions.
+    
+    Args:
+        path: File to write
+        data: Content of the file
+        mode: Permissions of the file (None keeps it private to the user)
+    """
+    import tempfile
+    
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
 # Main command group
 @click.group()
 @click.version_option("0.1.0")
@@ -45,7 +282,7 @@ def cli():
 
 @cli.command("diff")
 @click.option("--all", is_flag=True, help="Show all files without limit")
-@click.option("--verbose", "-v", is_flag=True, help="Show detailed information during execution")
+@verbose_option
 @click.option("--patches", is_flag=True, help="Show only information related to patches")
 @site_option
 def diff_command(all, verbose, patches, site):
@@ -53,6 +290,8 @@ def diff_command(all, verbose, patches, site):
     Shows the differences between the remote server and the local environment.
     This command is always read-only and never makes changes.
     """
+    from commands.diff import show_diff
+    
     # Select site if necessary
     config = get_yaml_config(verbose=verbose)
     if not config.select_site(site):
@@ -63,9 +302,8 @@ def diff_command(all, verbose, patches, site):
         sys.exit(1)
     
 @cli.command("sync-files")
-@click.option("--dry-run", is_flag=True, help="Simulate operation without making changes")
-@click.option("--direction", type=click.Choice(['from-remote', 'to-remote']), 
-              default='from-remote', help="Direction of synchronization")
+@dry_run_option
+@direction_option
 @click.option("--clean/--no-clean", default=True, help="Clean excluded files after synchronization")
 @click.option("--skip-backup", is_flag=True, help="Skip creating a full backup before synchronizing from remote")
 @click.option("--patch-exclusions", type=click.Choice(['default', 'disabled', 'local-only', 'remote-only', 'both-ways']), 
@@ -90,6 +328,8 @@ def sync_files_command(dry_run, direction, clean, skip_backup, patch_exclusions,
     - remote-only: excludes patches only when synchronizing from local to remote  
     - both-ways: excludes patches in both directions
     """
+    from commands.sync import sync_files
+    
     # Select site if necessary
     config = get_yaml_config()
     if not config.select_site(site):
@@ -102,30 +342,29 @@ def sync_files_command(dry_run, direction, clean, skip_backup, patch_exclusions,
         # Save the original value
         original_exclusions_mode = config.get("patches", "exclusions_mode", default="local-only")
         # Modify the configuration temporarily
-        if "patches" not in config.config:
-            config.config["patches"] = {}
-        config.config["patches"]["exclusions_mode"] = patch_exclusions
+        config.set("patches", "exclusions_mode", value=patch_exclusions)
     
     # Execute synchronization
     success = sync_files(direction=direction, dry_run=dry_run, clean=clean, skip_full_backup=skip_backup)
     
     # Restore the original configuration if it was modified
     if original_exclusions_mode is not None:
-        config.config["patches"]["exclusions_mode"] = original_exclusions_mode
+        config.set("patches", "exclusions_mode", value=original_exclusions_mode)
     
     if not success:
         sys.exit(1)
     
 @cli.command("sync-db")
-@click.option("--dry-run", is_flag=True, help="Simulate operation without making changes")
-@click.option("--direction", type=click.Choice(['from-remote', 'to-remote']), 
-              default='from-remote', help="Direction of synchronization")
-@click.option("--verbose", "-v", is_flag=True, help="Show detailed information during execution")
+@dry_run_option
+@direction_option
+@verbose_option
 @site_option
 def sync_db_command(dry_run, direction, verbose, site):
     """
     Synchronizes the database between the remote server and the local environment.
     """
+    from commands.database import sync_database
+    
     # Select site if necessary
     config = get_yaml_config(verbose=verbose)
     if not config.select_site(site):
@@ -137,9 +376,10 @@ def sync_db_command(dry_run, direction, verbose, site):
 
 @cli.command("media-path")
 @click.option("--remote", is_flag=True, help="Apply on the remote server instead of locally")
-@click.option("--verbose", "-v", is_flag=True, help="Show detailed information during execution")
+@verbose_option
+@click.option("--force", is_flag=True, help="Apply the configuration even if it is already up to date")
 @site_option
-def media_path_command(remote, verbose, site):
+def media_path_command(remote, verbose, force, site):
     """
     Configures the WordPress media path using the WP Original Media Path plugin.
     
@@ -151,22 +391,23 @@ def media_path_command(remote, verbose, site):
       media-path                 # Configure in local environment
       media-path --remote        # Configure in remote server
       media-path --verbose       # Show detailed information
+      media-path --force         # Apply again even if nothing changed
     """
+    from commands.media import configure_media_path
+    
     # Select site if necessary
     config = get_yaml_config(verbose=verbose)
     if not config.select_site(site):
         sys.exit(1)
         
-    # Get the configuration
-    media_config = config.config.get("media", {})
-    expert_mode = media_config.get("expert_mode", False)
-    
     success = configure_media_path(
         media_url=None,  # Force to get value from config.yaml
-        expert_mode=expert_mode,
+        expert_mode=config.get_expert_mode(),
         media_path=None,  # Force to get value from config.yaml
         remote=remote,
-        verbose=verbose
+        verbose=verbose,
+        force=force,
+        config=config
     )
     
     if not success:
@@ -178,7 +419,7 @@ def media_path_command(remote, verbose, site):
 @click.option("--add", is_flag=True, help="Register a new patch")
 @click.option("--remove", is_flag=True, help="Remove a patch from the registry")
 @click.option("--info", is_flag=True, help="Show detailed information about a patch without applying it")
-@click.option("--dry-run", is_flag=True, help="Simulate operation without making changes")
+@dry_run_option
 @click.option("--description", "-d", help="Patch description (when registering)")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed information")
 @click.option("--config", is_flag=True, help="Show patch system configuration")
@@ -199,6 +440,8 @@ def patch_command(file_path, list, add, remove, info, dry_run, description, verb
       patch --info wp-content/plugins/x/y.php   # View details without applying
       patch --config                      # View patch system configuration
     """
+    from commands.patch import list_patches, apply_patch, add_patch, remove_patch
+    
     # Select site if necessary
     config_obj = get_yaml_config(verbose=verbose)
     if not config_obj.select_site(site):
@@ -258,11 +501,12 @@ def patch_command(file_path, list, add, remove, info, dry_run, description, verb
 
 @cli.command("patch-commit")
 @click.argument("file_path", required=False)
-@click.option("--dry-run", is_flag=True, help="Simulate operation without making changes")
+@dry_run_option
 @click.option("--force", is_flag=True, help="Force application even with modified or different versions")
-@click.option("--verbose", "-v", is_flag=True, help="Show detailed information during execution")
+@verbose_option
+@click.option("--yes", "-y", is_flag=True, help="Skip the confirmation prompt")
 @site_option
-def patch_commit_command(file_path, dry_run, force, verbose, site):
+def patch_commit_command(file_path, dry_run, force, verbose, yes, site):
     """
     Applies registered patches to the remote server.
     
@@ -277,7 +521,10 @@ def patch_commit_command(file_path, dry_run, force, verbose, site):
       patch-commit                           # Apply all registered patches
       patch-commit --dry-run                 # View what changes would be made without applying
       patch-commit --force                   # Force application even with modified
+      patch-commit --yes                     # Apply without asking for confirmation
     """
+    from commands.patch import apply_patch
+    
     # Select site if necessary
     config = get_yaml_config(verbose=verbose)
     if not config.select_site(site):
@@ -295,14 +542,13 @@ def patch_commit_command(file_path, dry_run, force, verbose, site):
         sys.exit(1)
     
     # Request explicit confirmation to apply patches
-    if not dry_run and not force:
+    if not dry_run and not force and not yes:
         if file_path:
             message = f"⚠️ Are you sure you want to apply the patch to '{file_path}'? This action will modify files on the server."
         else:
             message = "⚠️ Are you sure you want to apply ALL registered patches? This action will modify files on the server."
         
-        confirm = input(f"{message} (s/N): ")
-        if confirm.lower() != "s":
+        if not click.confirm(message, default=False):
             print("❌ Operation cancelled.")
             sys.exit(0)
     
@@ -314,7 +560,7 @@ def patch_commit_command(file_path, dry_run, force, verbose, site):
 
 @cli.command("rollback")
 @click.argument("file_path")
-@click.option("--dry-run", is_flag=True, help="Simulate operation without making changes")
+@dry_run_option
 @site_option
 def rollback_command(file_path, dry_run, site):
     """
@@ -324,6 +570,8 @@ def rollback_command(file_path, dry_run, site):
     It works only with patches that have been applied previously and are registered
     in the patches.lock.json file.
     """
+    from commands.patch import rollback_patch
+    
     # Select site if necessary
     config = get_yaml_config()
     if not config.select_site(site):
@@ -337,7 +585,7 @@ def rollback_command(file_path, dry_run, site):
 @click.option("--show", is_flag=True, help="Show current configuration")
 @click.option("--repair", is_flag=True, help="Repair configuration if there are structure problems")
 @click.option("--output", type=str, default="wp-deploy.yaml", help="Output path for configuration file")
-@click.option("--verbose", "-v", is_flag=True, help="Show detailed information during execution")
+@verbose_option
 @site_option
 def config_command(show, repair, output, verbose, site):
     """
@@ -357,34 +605,47 @@ def config_command(show, repair, output, verbose, site):
         config.display()
     elif repair:
         # Repair configuration
-        import shutil
+        import yaml
+        
+        # Read the current file once: the same bytes are used for the backup and the parsing
+        raw = None
+        mode = None
+        try:
+            raw = output_path.read_bytes()
+            mode = os.stat(output_path).st_mode
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            click.echo(f"⚠️ Error reading current configuration: {str(e)}")
         
-        # Make a backup if the file exists
-        if output_path.exists():
+        # Make a backup if the file exists, with the permissions of the original
+        if raw is not None:
             backup_path = output_path.with_suffix(".yaml.bak")
-            shutil.copy2(output_path, backup_path)
+            _replace_file(backup_path, raw, mode)
             click.echo(f"✅ Backup created: {backup_path}")
             
         # Read existing template if exists
         existing_config = {}
-        if output_path.exists():
+        if raw:
             try:
-                with open(output_path, 'r') as f:
-                    existing_config = yaml.safe_load(f) or {}
+                existing_config = yaml.load(raw, Loader=SafeLoader) or {}
             except Exception as e:
                 click.echo(f"⚠️ Error reading current configuration: {str(e)}")
                 
         # Ensure all main sections exist
-        sections = ["ssh", "security", "database", "urls", "media", "exclusions", "protected_files"]
+        missing = REQUIRED_SECTIONS - existing_config.keys()
         
-        for section in sections:
-            if section not in existing_config:
+        # Iterate in the canonical order so sections are written in a stable order
+        for section in CONFIG_SECTIONS:
+            if section in missing:
                 existing_config[section] = config.config.get(section, {})
                 
-        # Save repaired configuration
+        # Save repaired configuration, replacing the file atomically
         try:
-            with open(output_path, 'w') as f:
-                yaml.dump(existing_config, f, default_flow_style=False, sort_keys=False)
+            data = yaml.dump(existing_config, Dumper=SafeDumper, default_flow_style=False,
+                             sort_keys=False, encoding="utf-8")
+            # Keep the permissions of the original file (new files stay private)
+            _replace_file(output_path, data, mode)
             click.echo(f"✅ Repaired configuration saved in {output_path}")
         except Exception as e:
             click.echo(f"❌ Error saving repaired configuration: {str(e)}")
@@ -495,7 +756,7 @@ def site_command(list, add, remove, set_default, init, from_current, verbose, si
     print("   For detailed help: site --help")
 
 @cli.command("check")
-@click.option("--verbose", "-v", is_flag=True, help="Show detailed information during execution")
+@verbose_option
 @site_option
 def check_command(verbose, site):
     """
@@ -506,95 +767,109 @@ def check_command(verbose, site):
     if site and not config.select_site(site):
         sys.exit(1)
         
-    import shutil
+    # Collect the report and write it with a single call
+    out = _Out()
     
-    click.echo("🔍 Verifying system requirements...")
-    
-    # Verify that rsync is installed
-    if shutil.which("rsync"):
-        click.echo("✅ rsync: Installed")
-    else:
-        click.echo("❌ rsync: Not found")
-        
-    # Verify that ssh is installed
-    if shutil.which("ssh"):
-        click.echo("✅ ssh: Installed")
-    else:
-        click.echo("❌ ssh: Not found")
+    try:
+        # Flattened view of the configuration for the checks below
+        snap = config.snapshot()
         
-    # Verify that ddev is installed (for sync-db)
-    if shutil.which("ddev"):
-        click.echo("✅ ddev: Installed")
-    else:
-        click.echo("⚠️ ddev: Not found (required for database synchronization)")
+        out("🔍 Verifying system requirements...")
         
-    # Verify SSH configuration
-    ssh_config = os.path.expanduser("~/.ssh/config")
-    if os.path.exists(ssh_config):
-        click.echo("✅ SSH configuration file: Found")
-    else:
-        click.echo("❌ SSH configuration file: Not found")
+        # Scan PATH once for all the required tools
+        executables = _path_executables(("rsync", "ssh", "ddev"))
         
-    # Verify project configuration
-    click.echo("\n🔍 Verifying YAML configuration structure...")
-    
-    # Verify main sections structure
-    sections = ["ssh", "security", "database", "urls", "media", "exclusions", "protected_files"]
-    all_good = True
-    
-    for section in sections:
-        if section in config.config:
-            click.echo(f"✅ Section '{section}': Present")
+        # Verify that rsync is installed
+        if "rsync" in executables:
+            out("✅ rsync: Installed")
         else:
-            click.echo(f"❌ Section '{section}': Missing")
-            all_good = False
-    
-    if not all_good:
-        click.echo("⚠️ Some sections of the configuration are missing. Run 'config --repair' to generate a complete template.")
-    
-    # Verify that paths exist
-    click.echo("\n🔍 Verifying paths and configuration...")
-    local_path = Path(config.get("ssh", "local_path"))
-    if local_path.exists():
-        click.echo(f"✅ Local path: Exists ({local_path})")
-    else:
-        click.echo(f"❌ Local path: Not exists ({local_path})")
-        
-    # Verify critical configuration variables
-    critical_configs = [
-        ("ssh", "remote_host"),
-        ("ssh", "remote_path"),
-        ("ssh", "local_path"),
-    ]
-    
-    for path in critical_configs:
-        if config.get(*path):
-            click.echo(f"✅ Configuration {'.'.join(path)}: Configured")
+            out("❌ rsync: Not found")
+            
+        # Verify that ssh is installed
+        if "ssh" in executables:
+            out("✅ ssh: Installed")
         else:
-            click.echo(f"❌ Configuration {'.'.join(path)}: Not configured")
+            out("❌ ssh: Not found")
             
-    # Verify exclusions
-    try:
-        exclusions = config.get_exclusions()
-        if exclusions:
-            click.echo(f"✅ Exclusions: {len(exclusions)} pattern configured")
+        # Verify that ddev is installed (for sync-db)
+        if "ddev" in executables:
+            out("✅ ddev: Installed")
         else:
-            click.echo("⚠️ Exclusions: No pattern configured")
-    except Exception as e:
-        click.echo(f"❌ Error verifying exclusions: {str(e)}")
+            out("⚠️ ddev: Not found (required for database synchronization)")
+            
+        # Check all the paths used below at once
+        ssh_config = os.path.expanduser("~/.ssh/config")
+        local_path_value = snap.get(("ssh", "local_path"))
+        exists = batch_exists([ssh_config] + ([local_path_value] if local_path_value else []))
         
-    # Verify media configuration
-    try:
-        media_config = config.get_media_config()
-        if media_config and media_config.get("url"):
-            click.echo(f"✅ Media URL configured: {media_config.get('url')}")
+        # Verify SSH configuration
+        if exists[ssh_config]:
+            out("✅ SSH configuration file: Found")
         else:
-            click.echo("ℹ️ Media URL not configured (standard path will be used)")
-    except Exception as e:
-        click.echo(f"❌ Error verifying media configuration: {str(e)}")
+            out("❌ SSH configuration file: Not found")
+            
+        # Verify project configuration
+        out("\n🔍 Verifying YAML configuration structure...")
+        
+        # Verify main sections structure
+        missing = REQUIRED_SECTIONS - config.config.keys()
+        
+        for section in CONFIG_SECTIONS:
+            if section in missing:
+                out(f"❌ Section '{section}': Missing")
+            else:
+                out(f"✅ Section '{section}': Present")
+        
+        if missing:
+            out("⚠️ Some sections of the configuration are missing. Run 'config --repair' to generate a complete template.")
+        
+        # Verify that paths exist
+        out("\n🔍 Verifying paths and configuration...")
+        if local_path_value and exists[local_path_value]:
+            out(f"✅ Local path: Exists ({local_path_value})")
+        else:
+            out(f"❌ Local path: Not exists ({local_path_value})")
+            
+        # Verify critical configuration variables
+        critical_configs = [
+            ("ssh", "remote_host"),
+            ("ssh", "remote_path"),
+            ("ssh", "local_path"),
+        ]
+        
+        for path in critical_configs:
+            if snap.get(path):
+                out(f"✅ Configuration {'.'.join(path)}: Configured")
+            else:
+                out(f"❌ Configuration {'.'.join(path)}: Not configured")
+                
+        # get_exclusions() prints its own warnings, keep them in order
+        out.flush()
+        
+        # Verify exclusions
+        try:
+            exclusions = config.get_exclusions()
+            if exclusions:
+                out(f"✅ Exclusions: {len(exclusions)} pattern configured")
+            else:
+                out("⚠️ Exclusions: No pattern configured")
+        except Exception as e:
+            out(f"❌ Error verifying exclusions: {str(e)}")
+            
+        # Verify media configuration
+        try:
+            media_config = config.get_media_config()
+            if media_config and media_config.get("url"):
+                out(f"✅ Media URL configured: {media_config.get('url')}")
+            else:
+                out("ℹ️ Media URL not configured (standard path will be used)")
+        except Exception as e:
+            out(f"❌ Error verifying media configuration: {str(e)}")
+    finally:
+        out.flush()
 
 @cli.command("debug-config")
-@click.option("--verbose", "-v", is_flag=True, help="Show detailed information during execution")
+@verbose_option
 @site_option
 def debug_config_command(verbose, site):
     """
@@ -605,54 +880,61 @@ def debug_config_command(verbose, site):
     if site and not config.select_site(site):
         sys.exit(1)
         
-    # Show configuration paths
-    print("\n🔍 Debugging configuration information:")
-    print(f"  - Detected root directory: {config.project_root}")
-    print(f"  - Deploy-tools directory: {config.deploy_tools_dir}")
-    
-    # Verify configuration files
-    global_config_file = config.deploy_tools_dir / "python" / "config.yaml"
-    project_config_file = config.project_root / "wp-deploy.yaml"
-    sites_config_file = config.deploy_tools_dir / "python" / "sites.yaml"
-    
-    print("\n📂 Configuration files:")
-    if global_config_file.exists():
-        print(f"  ✅ Global file: {global_config_file} (EXISTS)")
-    else:
-        print(f"  ❌ Global file: {global_config_file} (DOES NOT EXIST)")
+    # Collect the report and write it with a single call
+    out = _Out()
+    try:
+        # Show configuration paths
+        out("\n🔍 Debugging configuration information:")
+        out(f"  - Detected root directory: {config.project_root}")
+        out(f"  - Deploy-tools directory: {config.deploy_tools_dir}")
         
-    if project_config_file.exists():
-        print(f"  ✅ Project file: {project_config_file} (EXISTS)")
-    else:
-        print(f"  ❌ Project file: {project_config_file} (DOES NOT EXIST)")
+        # Verify configuration files
+        global_config_file = config.deploy_tools_dir / "python" / "config.yaml"
+        project_config_file = config.project_root / "wp-deploy.yaml"
+        sites_config_file = config.deploy_tools_dir / "python" / "sites.yaml"
         
-    if sites_config_file.exists():
-        print(f"  ✅ Sites file: {sites_config_file} (EXISTS)")
+        exists = batch_exists([global_config_file, project_config_file, sites_config_file])
         
-        # Show site information
-        available_sites = config.get_available_sites()
-        default_site = config.get_default_site()
-        
-        if available_sites:
-            print(f"     Configured sites: {len(available_sites)}")
-            print(f"     Default site: {default_site if default_site else 'None'}")
-            print(f"     Current site: {config.current_site if hasattr(config, 'current_site') and config.current_site else 'None'}")
+        out("\n📂 Configuration files:")
+        if exists[global_config_file]:
+            out(f"  ✅ Global file: {global_config_file} (EXISTS)")
         else:
-            print(f"     No sites configured")
-    else:
-        print(f"  ❌ Sites file: {sites_config_file} (DOES NOT EXIST)")
+            out(f"  ❌ Global file: {global_config_file} (DOES NOT EXIST)")
+            
+        if exists[project_config_file]:
+            out(f"  ✅ Project file: {project_config_file} (EXISTS)")
+        else:
+            out(f"  ❌ Project file: {project_config_file} (DOES NOT EXIST)")
+            
+        if exists[sites_config_file]:
+            out(f"  ✅ Sites file: {sites_config_file} (EXISTS)")
+            
+            # Show site information
+            available_sites = config.get_available_sites()
+            default_site = config.get_default_site()
+            
+            if available_sites:
+                out(f"     Configured sites: {len(available_sites)}")
+                out(f"     Default site: {default_site if default_site else 'None'}")
+                out(f"     Current site: {config.current_site if hasattr(config, 'current_site') and config.current_site else 'None'}")
+            else:
+                out(f"     No sites configured")
+        else:
+            out(f"  ❌ Sites file: {sites_config_file} (DOES NOT EXIST)")
+            
+        # Show critical configuration values
+        out("\n🔑 REAL VALUES of database configuration (never shown in other commands):")
+        db_config = config.config.get('database', {}).get('remote', {})
+        out(f"  - Host: {db_config.get('host', 'Not configured')}")
+        out(f"  - Name: {db_config.get('name', 'Not configured')}")
+        out(f"  - User: {db_config.get('user', 'Not configured')}")
+        out(f"  - Password: {'*'*len(db_config.get('password', '')) if 'password' in db_config else 'Not configured'}")
         
-    # Show critical configuration values
-    print("\n🔑 REAL VALUES of database configuration (never shown in other commands):")
-    db_config = config.config.get('database', {}).get('remote', {})
-    print(f"  - Host: {db_config.get('host', 'Not configured')}")
-    print(f"  - Name: {db_config.get('name', 'Not configured')}")
-    print(f"  - User: {db_config.get('user', 'Not configured')}")
-    print(f"  - Password: {'*'*len(db_config.get('password', '')) if 'password' in db_config else 'Not configured'}")
-    
-    print("\n⚠️  IMPORTANT: For security, when you use normal commands like 'config --show',")
-    print("   example values will be shown for sensitive credentials (as seen below).")
-    print("   Real values are used internally but not shown to protect credentials.")
+        out("\n⚠️  IMPORTANT: For security, when you use normal commands like 'config --show',")
+        out("   example values will be shown for sensitive credentials (as seen below).")
+        out("   Real values are used internally but not shown to protect credentials.")
+    finally:
+        out.flush()
     
     # Show complete configuration with masked values
     print("\n🔧 Configuration as shown normally (with hidden credentials):")
@@ -662,9 +944,10 @@ def debug_config_command(verbose, site):
 @click.option("--with-db", is_flag=True, help="Include database synchronization")
 @click.option("--with-media", is_flag=True, help="Configure media URLs")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed information")
-@click.option("--dry-run", is_flag=True, help="Simulate operation without making changes")
+@dry_run_option
+@click.option("--parallel", is_flag=True, help="Download the database while the files are synchronized (with --with-db)")
 @site_option
-def init_command(with_db, with_media, verbose, dry_run, site):
+def init_command(with_db, with_media, verbose, dry_run, parallel, site):
     """
     Initializes a complete development environment in a single step.
     
@@ -677,7 +960,16 @@ def init_command(with_db, with_media, verbose, dry_run, site):
     - sync-files
     - sync-db (if --with-db)
     - media-path (if --with-media)
+    
+    With --parallel, the remote database is exported and downloaded while
+    the files are synchronized (their output is interleaved). It is only
+    imported, and its URLs replaced, once the files have finished, since
+    those WP-CLI steps need the WordPress files in place.
     """
+    from commands.sync import sync_files
+    from commands.database import sync_database
+    from commands.media import configure_media_path
+    
     # Select site if necessary
     config = get_yaml_config(verbose=verbose)
     if not config.select_site(site):
@@ -685,33 +977,50 @@ def init_command(with_db, with_media, verbose, dry_run, site):
     
     print("🚀 Initializing development environment...")
     
-    # 1. Synchronize files
-    print("\n📂 Step 1: Synchronization of files")
-    success = sync_files(direction="from-remote", dry_run=dry_run, clean=True)
-    if not success:
-        print("❌ Error in file synchronization")
-        sys.exit(1)
-    
-    # 2. Synchronize database (optional)
-    if with_db:
-        print("\n🗄️ Step 2: Synchronization of database")
-        success = sync_database(direction="from-remote", dry_run=dry_run, verbose=verbose)
-        if not success:
+    if parallel and with_db:
+        # The files are synchronized in a thread while the database is exported
+        # and downloaded; the import waits until the files are in place
+        from concurrent.futures import ThreadPoolExecutor
+        
+        print("\n📂🗄️ Steps 1 and 2: Synchronization of files and database (download in parallel)")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            files_future = executor.submit(sync_files, direction="from-remote", dry_run=dry_run, clean=True, config=config)
+            db_success = sync_database(direction="from-remote", dry_run=dry_run, verbose=verbose, config=config,
+                                       before_import=files_future.result)
+            files_success = files_future.result()
+        
+        if not files_success:
+            print("❌ Error in file synchronization")
+        if not db_success:
             print("❌ Error in database synchronization")
+        if not (files_success and db_success):
+            sys.exit(1)
+    else:
+        # 1. Synchronize files
+        print("\n📂 Step 1: Synchronization of files")
+        success = sync_files(direction="from-remote", dry_run=dry_run, clean=True, config=config)
+        if not success:
+            print("❌ Error in file synchronization")
             sys.exit(1)
+        
+        # 2. Synchronize database (optional)
+        if with_db:
+            print("\n🗄️ Step 2: Synchronization of database")
+            success = sync_database(direction="from-remote", dry_run=dry_run, verbose=verbose, config=config)
+            if not success:
+                print("❌ Error in database synchronization")
+                sys.exit(1)
     
     # 3. Configure media paths (optional)
     if with_media:
         print("\n🖼️ Step 3: Configure media paths")
-        media_config = config.config.get("media", {})
-        expert_mode = media_config.get("expert_mode", False)
-        
         success = configure_media_path(
             media_url=None,
-            expert_mode=expert_mode,
+            expert_mode=config.get_expert_mode(),
             media_path=None,
             remote=False,
-            verbose=verbose
+            verbose=verbose,
+            config=config
         )
         if not success:
             print("❌ Error in media path configuration")
@@ -722,8 +1031,9 @@ def init_command(with_db, with_media, verbose, dry_run, site):
 
 @cli.command()
 @click.option('--path', '-p', help='Path inside DDEV container where to search WordPress (obsolete, use sites.yaml)')
+@click.option("--json", "as_json", is_flag=True, help="Print the result as JSON")
 @site_option
-def verify_wp(path, site):
+def verify_wp(path, as_json, site):
     """
     Verifies if WordPress is correctly installed.
     
@@ -732,189 +1042,249 @@ def verify_wp(path, site):
     on files .ddev.
     """
     from utils.wp_cli import run_wp_cli
-    from config_yaml import get_yaml_config
-    import os
     
     # Get sites configuration
     config = get_yaml_config()
     if not config.select_site(site):
         sys.exit(1)
     
-    print(f"🔍 Verifying WordPress installation...")
+    base_path, docroot, wp_path, project_dir = _require_ddev_config(config)
     
-    # Get project local directory from configuration
-    if 'ssh' not in config.config or 'local_path' not in config.config['ssh']:
-        print("❌ Error: No local path configuration found in sites.yaml")
-        sys.exit(1)
+    # Collect the messages and write them with a single call
+    out = _Out(quiet=as_json)
+    try:
+        out(f"🔍 Verifying WordPress installation...")
+        out(f"ℹ️ Project DDEV directory: {project_dir}")
         
-    # Get project local directory directly from sites.yaml
-    local_path_str = config.config['ssh']['local_path']
-    
-    # Get project base directory
-    # Example: /home/user/proyecto/app/public -> /home/user/proyecto
-    local_path = Path(local_path_str)
-    project_dir = local_path.parent.parent  # Up two levels from app/public
-    
-    print(f"ℹ️ Project DDEV directory: {project_dir}")
-    
-    # Get wp_path from base_path and docroot parameters (explicitly required)
-    if 'ddev' not in config.config:
-        print("❌ Error: No ddev section found in sites.yaml")
-        sys.exit(1)
+        # Ignore any path passed by parameter (obsolete)
+        if path:
+            out("⚠️ Ignoring --path parameter (obsolete)")
+            out("   Path is obtained automatically from sites.yaml (ddev.base_path + ddev.docroot)")
         
-    # Explicitly require both parameters (fail fast)
-    if 'base_path' not in config.config['ddev'] or 'docroot' not in config.config['ddev']:
-        print("❌ Error: Complete DDEV configuration not found in sites.yaml")
-        print("   Both parameters are required:")
-        print("   - ddev.base_path: Base path inside container (e.g. \"/var/www/html\")")
-        print("   - ddev.docroot: Docroot directory (e.g. \"app/public\")")
-        sys.exit(1)
-    
-    # Build wp_path with configured parameters
-    base_path = config.config['ddev']['base_path']
-    docroot = config.config['ddev']['docroot']
-    wp_path = f"{base_path}/{docroot}"
-    
-    # Ignore any path passed by parameter (obsolete)
-    if path:
-        print("⚠️ Ignoring --path parameter (obsolete)")
-        print("   Path is obtained automatically from sites.yaml (ddev.base_path + ddev.docroot)")
-    
-    print(f"ℹ️ Using WordPress path inside container: {wp_path}")
+        out(f"ℹ️ Using WordPress path inside container: {wp_path}")
+            
+        # Verify that directory exists in the system
+        if not _is_dir_cached(project_dir):
+            if as_json:
+                _emit_json({
+                    "site": config.current_site,
+                    "project_dir": project_dir,
+                    "wp_path": wp_path,
+                    "installed": False,
+                    "error": f"Project directory '{project_dir}' does not exist",
+                })
+            out.die(ERR_PROJECT_DIR_MISSING.format(project_dir))
         
-    # Verify that directory exists in the system
-    if not project_dir.exists():
-        print(f"❌ Error: Project directory '{project_dir}' does not exist")
-        sys.exit(1)
-    
-    # Execute verification with specified path
-    code, stdout, stderr = run_wp_cli(
-        ["core", "is-installed"],
-        project_dir,  # Execute in project directory
-        remote=False,
-        use_ddev=True,
-        wp_path=wp_path
-    )
-    
-    # Show result
-    if code == 0:
-        print("✅ WordPress is correctly installed and configured")
-        sys.exit(0)
-    else:
-        print("❌ WordPress is not installed or could not be detected")
-        if stderr:
-            print(f"   Error: {stderr}")
-        print(f"   Used path: {wp_path}")
-        sys.exit(1)
+        # Show progress before waiting for the container
+        out.flush()
+        
+        # Execute verification with specified path
+        code, stdout, stderr = run_wp_cli(
+            ["core", "is-installed"],
+            project_dir,  # Execute in project directory
+            remote=False,
+            use_ddev=True,
+            wp_path=wp_path,
+            check_only=True
+        )
+        
+        if as_json:
+            _emit_json({
+                "site": config.current_site,
+                "project_dir": project_dir,
+                "wp_path": wp_path,
+                "installed": code == 0,
+                "error": stderr or None,
+            })
+        
+        # Show result
+        if code == 0:
+            out("✅ WordPress is correctly installed and configured")
+            sys.exit(0)
+        else:
+            lines = [ERR_WP_NOT_INSTALLED]
+            if stderr:
+                lines.append(f"   Error: {stderr}")
+            lines.append(f"   Used path: {wp_path}")
+            out.die(*lines)
+    finally:
+        out.flush()
 
 @cli.command()
+@click.option("--json", "as_json", is_flag=True, help="Print the configuration as JSON")
 @site_option
-def show_ddev_config(site):
+def show_ddev_config(as_json, site):
     """
     Shows the WordPress configuration from sites.yaml.
     
     Useful for diagnosing problems related to WordPress path.
     """
-    import subprocess
-    import os
-    from config_yaml import get_yaml_config
-    from pathlib import Path
-    
     # Get sites configuration
     config = get_yaml_config()
     if not config.select_site(site):
         sys.exit(1)
     
-    print("🔍 Getting configuration from sites.yaml...")
+    base_path, docroot, wp_path, project_dir = _require_ddev_config(config)
     
-    # Verify if DDEV configuration exists in sites.yaml
-    if 'ddev' not in config.config:
-        print("❌ No DDEV configuration found in sites.yaml")
-        sys.exit(1)
+    result = {
+        "site": config.current_site,
+        "base_path": base_path,
+        "docroot": docroot,
+        "wp_path": wp_path,
+        "project_dir": project_dir,
+    }
     
-    # Get project local directory from configuration
-    if 'ssh' not in config.config or 'local_path' not in config.config['ssh']:
-        print("❌ Error: No local path configuration found in sites.yaml")
-        sys.exit(1)
+    # Collect the messages and write them with a single call
+    out = _Out(quiet=as_json)
+    try:
+        out("🔍 Getting configuration from sites.yaml...")
+        
+        # Show information from sites.yaml
+        out("📋 DDEV configuration found in sites.yaml:")
+        out(f"   - base_path: {base_path}")
+        out(f"   - docroot: {docroot}")
+        out(f"   - Complete WP path: {wp_path}")
+        out(f"   - Project local directory: {project_dir}")
+        
+        # Verify that directory exists
+        result["project_dir_exists"] = _is_dir_cached(project_dir)
+        if not result["project_dir_exists"]:
+            out(f"   ❌ Project directory does not exist: {project_dir}")
+        else:
+            out(f"   ✅ Project directory exists")
+        
+        # Execute ddev describe to show URLs (in the correct directory)
+        out("\n📡 DDEV describe:")
+        out.flush()
+        
+        try:
+            code, describe, lines, stderr = _ddev_describe(project_dir)
+            
+            if code == 0:
+                result["ddev_describe"] = describe
+                if describe is not None:
+                    for key, label in DDEV_DESCRIBE_FIELDS:
+                        if describe.get(key):
+                            out(f"   {label}: {describe[key]}")
+                else:
+                    # Unexpected format, show the lines as they are
+                    for line in lines:
+                        out(f"   {line}")
+            else:
+                result["ddev_error"] = stderr
+                out(f"   ❌ Error: {stderr}")
+        except Exception as e:
+            result["ddev_error"] = str(e)
+            out(f"   ❌ Error executing ddev describe: {str(e)}")
+        
+        # Suggest command to verify WordPress
+        out(f"\n💡 To verify WordPress, execute:")
+        out(f"   python cli.py verify-wp --site={config.current_site}")
+            
+        # Show URL values
+        if 'urls' in config.config and 'remote' in config.config['urls']:
+            out(f"\n🌐 Remote URL configured: {config.config['urls']['remote']}")
+        if 'urls' in config.config and 'local' in config.config['urls']:
+            out(f"🖥️ Local URL configured: {config.config['urls']['local']}")
         
-    # Show information from sites.yaml
-    print("📋 DDEV configuration found in sites.yaml:")
+        if as_json:
+            result["urls"] = config.config.get("urls") or {}
+            _emit_json(result)
+    finally:
+        out.flush()
+
+@cli.command("diagnose")
+@site_option
+def diagnose_command(site):
+    """
+    Diagnoses the DDEV project and the WordPress installation of a site.
     
-    ddev_config = config.config['ddev']
+    Combines show-ddev-config and verify-wp: DDEV is described once and
+    WordPress is only checked if the project is running. A running project
+    still takes two ddev processes, since 'ddev describe' runs on the host
+    and cannot share the 'ddev exec' of the WordPress check.
+    """
+    from utils.wp_cli import run_wp_cli
     
-    # Verify that both required parameters exist
-    if 'base_path' not in ddev_config or 'docroot' not in ddev_config:
-        print("❌ Error: Complete DDEV configuration not found in sites.yaml")
-        print("   Both parameters are required:")
-        print("   - ddev.base_path: Base path inside container (e.g. \"/var/www/html\")")
-        print("   - ddev.docroot: Docroot directory (e.g. \"app/public\")")
+    # Get sites configuration
+    config = get_yaml_config()
+    if not config.select_site(site):
         sys.exit(1)
     
-    # Show information from current configuration
-    base_path = ddev_config['base_path']
-    docroot = ddev_config['docroot']
-    wp_path = f"{base_path}/{docroot}"
-    
-    print(f"   - base_path: {base_path}")
-    print(f"   - docroot: {docroot}")
-    print(f"   - Complete WP path: {wp_path}")
-    
-    # Get project local directory directly from sites.yaml
-    local_path_str = config.config['ssh']['local_path']
-    local_path = Path(local_path_str)
-    
-    # Get project base directory
-    # Example: /home/user/proyecto/app/public -> /home/user/proyecto
-    project_dir = local_path.parent.parent  # Up two levels from app/public
-    
-    print(f"   - Project local directory: {project_dir}")
-    
-    # Verify that directory exists
-    if not project_dir.exists():
-        print(f"   ❌ Project directory does not exist: {project_dir}")
-    else:
-        print(f"   ✅ Project directory exists")
-    
-    # Execute ddev describe to show URLs (in the correct directory)
-    print("\n📡 DDEV describe:")
+    base_path, docroot, wp_path, project_dir = _require_ddev_config(config)
     
+    # Collect the messages and write them with a single call
+    out = _Out()
     try:
-        result = subprocess.run(
-            ["ddev", "describe"], 
-            cwd=project_dir,  # Execute in project directory
-            capture_output=True, 
-            text=True, 
-            check=False
+        out(f"ℹ️ Project DDEV directory: {project_dir}")
+        out(f"ℹ️ Using WordPress path inside container: {wp_path}")
+        
+        if not _is_dir_cached(project_dir):
+            out.die(ERR_PROJECT_DIR_MISSING.format(project_dir))
+        
+        # 1. Describe the DDEV project
+        out("\n📡 DDEV describe:")
+        out.flush()
+        try:
+            code, describe, _, stderr = _ddev_describe(project_dir)
+        except Exception as e:
+            out.die(f"   ❌ Error executing ddev describe: {str(e)}")
+        
+        if code != 0:
+            out.die(f"   ❌ Error: {stderr}")
+        
+        describe = describe or {}
+        for key, label in DDEV_DESCRIBE_FIELDS:
+            if describe.get(key):
+                out(f"   {label}: {describe[key]}")
+        
+        # 2. Verify WordPress, only possible while the project is running
+        out("\n🔍 Verifying WordPress installation...")
+        if describe.get("status") != "running":
+            status_line, hint = ERR_DDEV_NOT_RUNNING
+            out.die(status_line.format(describe.get("status", "unknown")), hint)
+        out.flush()
+        
+        code, stdout, stderr = run_wp_cli(
+            ["core", "is-installed"],
+            project_dir,
+            remote=False,
+            use_ddev=True,
+            wp_path=wp_path,
+            check_only=True
         )
         
-        if result.returncode == 0:
-            for line in result.stdout.splitlines():
-                if ":" in line:
-                    print(f"   {line.strip()}")
+        if code == 0:
+            out("✅ WordPress is correctly installed and configured")
+            sys.exit(0)
         else:
-            print(f"   ❌ Error: {result.stderr}")
-    except Exception as e:
-        print(f"   ❌ Error executing ddev describe: {str(e)}")
-    
-    # Suggest command to verify WordPress
-    print(f"\n💡 To verify WordPress, execute:")
-    print(f"   python cli.py verify-wp --site={config.current_site}")
-        
-    # Show URL values
-    if 'urls' in config.config and 'remote' in config.config['urls']:
-        print(f"\n🌐 Remote URL configured: {config.config['urls']['remote']}")
-    if 'urls' in config.config and 'local' in config.config['urls']:
-        print(f"🖥️ Local URL configured: {config.config['urls']['local']}")
+            lines = [ERR_WP_NOT_INSTALLED]
+            if stderr:
+                lines.append(f"   Error: {stderr}")
+            lines.append(f"   Used path: {wp_path}")
+            out.die(*lines)
+    finally:
+        out.flush()
 
 @cli.command("backup")
 @click.option("--output-dir", help="Directory where to save the backup (optional)")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed information during backup creation")
+@click.option("--fast", is_flag=True, help="Compress faster at the cost of a larger file")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), help="Number of compression threads (default: number of CPUs)")
+@click.option("--format", "archive_format", type=click.Choice(["zip", "tar.zst"]), default="zip",
+              help="Archive format (tar.zst is faster, requires the zstandard package)")
+@click.option("--codec", type=click.Choice(["deflate", "store", "zstd"]), default="deflate",
+              help="Compression of the ZIP entries (zstd requires Python 3.14)")
+@click.option("--count/--no-count", default=False,
+              help="Scan the files first so the progress bar shows the total size (default: --no-count)")
+@click.option("--json", "as_json", is_flag=True, help="Print the result as JSON (progress goes to stderr)")
 @site_option
-def backup_command(output_dir, verbose, site):
+def backup_command(output_dir, verbose, fast, jobs, archive_format, codec, count, as_json, site):
     """
     Creates a full backup of the local environment.
     
-    This command generates a ZIP file with all files from the local environment,
+    This command generates a ZIP file (or a tar.zst archive with --format)
+    with all files from the local environment,
     independently of the exclusions configured for synchronization.
     The backup includes all files, including applied patches.
     
@@ -924,7 +1294,15 @@ def backup_command(output_dir, verbose, site):
     Examples:
       backup                      # Creates a backup in the default directory
       backup --output-dir /tmp    # Saves the backup in /tmp
+      backup --fast               # Uses the fastest compression level
+      backup --jobs 2             # Compresses with only two threads
+      backup --format tar.zst     # Creates a zstd-compressed tar archive
+      backup --codec store        # Creates a ZIP file without compression
+      backup --count              # Shows the total size (scans the files first)
+      backup --json               # Prints the backup path as JSON
     """
+    from commands.backup import create_full_backup, FAST_COMPRESSLEVEL
+    
     # Select site if necessary
     config = get_yaml_config(verbose=verbose)
     if not config.select_site(site):
@@ -932,18 +1310,31 @@ def backup_command(output_dir, verbose, site):
         
     site_name = config.current_site or "wordpress"
     
-    print(f"📦 Creating full backup of local environment for '{site_name}'...")
+    # In JSON mode the progress messages go to stderr, keeping stdout for the result
+    with contextlib.redirect_stdout(sys.stderr) if as_json else contextlib.nullcontext():
+        print(f"📦 Creating full backup of local environment for '{site_name}'...")
+        
+        try:
+            backup_path = create_full_backup(
+                site_alias=site,
+                output_dir=output_dir,
+                compresslevel=FAST_COMPRESSLEVEL if fast else None,
+                jobs=jobs,
+                archive_format=archive_format,
+                show_progress_total=count,
+                codec=codec
+            )
+            print(f"✅ Backup completed successfully")
+            print(f"📂 Backup saved in: {backup_path}")
+        except Exception as e:
+            print(f"❌ Error creating backup: {str(e)}")
+            if verbose:
+                import traceback
+                traceback.print_exc()
+            sys.exit(1)
     
-    try:
-        backup_path = create_full_backup(site_alias=site, output_dir=output_dir)
-        print(f"✅ Backup completed successfully")
-        print(f"📂 Backup saved in: {backup_path}")
-    except Exception as e:
-        print(f"❌ Error creating backup: {str(e)}")
-        if verbose:
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
+    if as_json:
+        _emit_json({"site": site_name, "backup_path": backup_path})
 
 def main():
     """
@@ -3,28 +3,592 @@ Commands to create complete backups without applying exclusions
 """
 
 import os
+import queue
 import shutil
+import tarfile
+import threading
 import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import zipfile
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 from tqdm import tqdm
 
 
 from config_yaml import get_yaml_config
+from utils.filesystem import is_network_filesystem
 
-def create_full_backup(site_alias: Optional[str] = None, output_dir: Optional[str] = None) -> str:
+# Faster DEFLATE implementations, used for the in-memory compression when installed:
+# libdeflate (deflate package) or ISA-L (isal package), otherwise zlib
+try:
+    import deflate as libdeflate
+except ImportError:
+    libdeflate = None
+try:
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+
+# Archive formats supported by create_full_backup
+ARCHIVE_FORMATS = ("zip", "tar.zst")
+
+# Compression of the entries of ZIP backups (zstd needs zipfile.ZIP_ZSTANDARD, Python 3.14+)
+ZIP_CODECS = ("deflate", "store", "zstd")
+
+# Level used by --fast (zlib or zstd): much quicker on trees of small PHP files
+# at the cost of a slightly larger archive
+FAST_COMPRESSLEVEL = 1
+
+# Default zstd level for tar.zst archives
+ZSTD_DEFAULT_LEVEL = 3
+
+# Already compressed formats common in wp-content, stored in the ZIP as they are
+# because DEFLATE would spend CPU without making them any smaller
+STORED_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.ico',
+    '.mp4', '.mov', '.webm', '.mp3', '.pdf',
+    '.zip', '.gz', '.bz2', '.xz', '.woff', '.woff2',
+})
+
+# Files smaller than this are stored too: DEFLATE can't save more than
+# the bytes its own framing costs
+STORE_MAX_SIZE = 64
+
+# Block size used to copy stored and large files into the ZIP
+STREAM_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Buffer of the archive file, so that it is written in large blocks
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Files up to this size are read and compressed in memory by the worker threads,
+# larger ones are streamed in blocks to keep memory usage bounded
+PARALLEL_MAX_FILE_SIZE = 16 * 1024 * 1024
+
+# Limits of each batch of files handed to a compression thread
+BATCH_MAX_FILES = 64
+BATCH_MAX_BYTES = 4 * 1024 * 1024
+
+# The progress bar is updated once per batch (ZIP) or every this many files (tar.zst)
+PROGRESS_UPDATE_FILES = 128
+
+# Files scanned ahead of the archive writer when scanning in the background
+SCAN_QUEUE_SIZE = 1024
+
+# How each file is written to the backup ZIP
+_DEFLATE, _STORE, _STREAM = range(3)
+
+def _iter_files(root: str) -> Iterator[os.DirEntry]:
+    """
+    Recursively yields the files below a directory
+    
+    Uses os.scandir so that the file type comes from the directory listing
+    and directories are told apart without a stat call. Like os.walk, symlinks to
+    directories are neither followed nor yielded. Subdirectories are kept
+    on a stack of paths rather than nested generators, so each file costs
+    the same however deep it is.
+    
+    Each file is stat'ed here and the result is cached by its entry, so the
+    writers always get a stat. Directories that cannot be listed and files
+    that vanish or cannot be stat'ed are reported and skipped, as os.walk
+    does, instead of aborting the whole backup.
+    
+    Args:
+        root: Directory to scan
+        
+    Yields:
+        os.DirEntry: Entry of each file (directories are not yielded)
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            it = os.scandir(directory)
+        except OSError as e:
+            print(f"⚠️ Skipping unreadable directory {directory}: {e}")
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                        continue
+                    entry.stat()
+                except OSError as e:
+                    print(f"⚠️ Skipping {entry.path}: {e}")
+                    continue
+                yield entry
+
+def _deflate(data: bytes, compresslevel: Optional[int]) -> bytes:
+    """
+    Compresses data as a raw DEFLATE stream, as stored in ZIP entries
+    
+    Uses libdeflate or ISA-L when available, which produce standard DEFLATE
+    streams considerably faster than zlib. ISA-L only has levels 0 to 3,
+    so zlib levels are mapped onto them.
+    
+    Args:
+        data: Data to compress
+        compresslevel: zlib compression level from 1 to 9 (None for the default)
+        
+    Returns:
+        bytes: Compressed data
+    """
+    level = 6 if compresslevel is None else compresslevel
+    if level > 0:
+        if libdeflate is not None:
+            return libdeflate.deflate_compress(data, level)
+        if isal_zlib is not None:
+            compressor = isal_zlib.compressobj(min(3, (level - 1) // 2), isal_zlib.DEFLATED, -15)
+            return compressor.compress(data) + compressor.flush()
+    
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+def _scan_in_background(root: str) -> Iterator[os.DirEntry]:
+    """
+    Yields the files below a directory while a thread scans ahead
+    
+    The scan (readdir and stat, which wait on the disk) runs in a separate
+    thread and feeds a bounded queue, so it overlaps with compressing and
+    writing the archive. The stat of each entry is fetched by the scanning
+    thread (see _iter_files) and cached by the DirEntry.
+    
+    Args:
+        root: Directory to scan
+        
+    Yields:
+        os.DirEntry: Entry of each file, in the same order as _iter_files
+    """
+    entries = queue.Queue(maxsize=SCAN_QUEUE_SIZE)
+    stop = threading.Event()
+    done = object()
+    
+    def scan():
+        try:
+            for entry in _iter_files(root):
+                if stop.is_set():
+                    return
+                entries.put(entry)
+        except Exception as e:
+            entries.put(e)
+        finally:
+            entries.put(done)
+    
+    scanner = threading.Thread(target=scan, name="backup-scan", daemon=True)
+    scanner.start()
+    try:
+        while True:
+            item = entries.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # If the writer stopped early, let the scanner see the stop
+        # signal instead of waiting for room in the queue forever
+        stop.set()
+        while scanner.is_alive():
+            try:
+                entries.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+def _arcname(path: str, prefix_len: int) -> str:
+    """
+    Gets the name of a file inside the archive from its scanned path
+    
+    Archives always use '/' as separator, so on Windows the
+    separators of the relative path are converted.
+    
+    Args:
+        path: Path of the file, starting with the backed up directory
+        prefix_len: Length of the backed up directory path plus its separator
+        
+    Returns:
+        str: Relative path of the file with '/' separators
+    """
+    rel_path = path[prefix_len:]
+    if os.sep != "/":
+        rel_path = rel_path.replace(os.sep, "/")
+    return rel_path
+
+def _zip_info(arcname: str, st: os.stat_result) -> zipfile.ZipInfo:
+    """
+    Builds the ZIP entry of a file from a stat result already at hand
+    
+    Does what ZipInfo.from_file does without calling stat again;
+    modification times before 1980 (not representable in ZIP) are clamped.
+    
+    Args:
+        arcname: Path of the file inside the ZIP
+        st: Result of stat on the file
+        
+    Returns:
+        zipfile.ZipInfo: Entry with its date, permissions and size set
+    """
+    date_time = time.localtime(st.st_mtime)[:6]
+    if date_time[0] < 1980:
+        date_time = (1980, 1, 1, 0, 0, 0)
+    zinfo = zipfile.ZipInfo(arcname, date_time)
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.file_size = st.st_size
+    return zinfo
+
+def _compress_entry(file_path: str, zinfo: zipfile.ZipInfo,
+                    compresslevel: Optional[int]) -> Optional[Tuple[zipfile.ZipInfo, bytes]]:
+    """
+    Reads and compresses a file for the backup ZIP
+    
+    zlib (like libdeflate and ISA-L) releases the GIL while compressing,
+    so several files can be compressed at the same time from different threads.
+    
+    Args:
+        file_path: Path of the file to compress
+        zinfo: Entry of the file, as built by _zip_info
+        compresslevel: zlib compression level (None for the zlib default)
+        
+    Returns:
+        Optional[Tuple[zipfile.ZipInfo, bytes]]: Entry and its compressed data, or None
+        if the file can no longer be read (e.g. deleted since the scan)
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        print(f"⚠️ Skipping {file_path}: {e}")
+        return None
+    
+    compressed = _deflate(data, compresslevel)
+    
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.file_size = len(data)
+    zinfo.compress_size = len(compressed)
+    zinfo.CRC = zlib.crc32(data)
+    
+    return zinfo, compressed
+
+def _compress_batch(items: List[Tuple[str, zipfile.ZipInfo, int]],
+                    compresslevel: Optional[int]) -> List[Optional[Tuple[zipfile.ZipInfo, bytes]]]:
+    """
+    Compresses a batch of files for the backup ZIP
+    
+    Args:
+        items: (file path, ZIP entry, write mode) of each file
+        compresslevel: zlib compression level (None for the zlib default)
+        
+    Returns:
+        List[Optional[Tuple[zipfile.ZipInfo, bytes]]]: Entry and compressed data of
+        each file (None for the files that could not be read)
+    """
+    return [_compress_entry(file_path, zinfo, compresslevel) for file_path, zinfo, _ in items]
+
+# ZipFile and ZipInfo internals used by _write_compressed
+_ZIPFILE_INTERNALS = ("_lock", "_writecheck", "_didModify", "start_dir", "fp", "filelist", "NameToInfo")
+
+def _can_write_compressed(zipf: zipfile.ZipFile) -> bool:
+    """
+    Checks that _write_compressed can append entries to a ZIP file
+    
+    Those internals are not part of the zipfile API and may change between
+    Python versions. Without them, the files are compressed by zipfile
+    while they are streamed instead of in the thread pool.
+    
+    Args:
+        zipf: ZIP file open for writing
+        
+    Returns:
+        bool: True if the internals used by _write_compressed are present
+    """
+    return (all(hasattr(zipf, name) for name in _ZIPFILE_INTERNALS)
+            and hasattr(zipfile.ZipInfo, "FileHeader"))
+
+def _write_compressed(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, data: bytes) -> None:
+    """
+    Appends an already compressed entry to an open ZIP file
+    
+    ZipFile has no public API for this, so it does the same bookkeeping
+    as ZipFile.writestr without compressing the data again. Only used
+    when _can_write_compressed(zipf) is True.
+    
+    Args:
+        zipf: ZIP file open for writing
+        zinfo: Entry with its sizes and CRC already set
+        data: Compressed data of the entry
+    """
+    with zipf._lock:
+        zipf._writecheck(zinfo)
+        zipf._didModify = True
+        zinfo.header_offset = zipf.fp.tell()
+        zipf.fp.write(zinfo.FileHeader(False))
+        zipf.fp.write(data)
+        zipf.filelist.append(zinfo)
+        zipf.NameToInfo[zinfo.filename] = zinfo
+        zipf.start_dir = zipf.fp.tell()
+
+def _write_streamed(zipf: zipfile.ZipFile, file_path: str, zinfo: zipfile.ZipInfo,
+                    compress_type: int, compresslevel: Optional[int] = None) -> bool:
+    """
+    Copies a file into an open ZIP file in large blocks
+    
+    Used for files that are stored as they are and for files too large to
+    be compressed in memory. ZipFile.write copies in 8 KiB chunks, here each
+    block of STREAM_BLOCK_SIZE is read, CRCed and compressed in one call.
+    
+    Args:
+        zipf: ZIP file open for writing
+        file_path: Path of the file to add
+        zinfo: Entry of the file, as built by _zip_info
+        compress_type: zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED
+        compresslevel: zlib compression level (None for the zlib default)
+        
+    Returns:
+        bool: True if the file was added, False if it can no longer be opened
+        (e.g. deleted since the scan), in which case nothing is written
+    """
+    zinfo.compress_type = compress_type
+    zinfo._compresslevel = compresslevel
+    
+    try:
+        src = open(file_path, 'rb', buffering=0)
+    except OSError as e:
+        print(f"⚠️ Skipping {file_path}: {e}")
+        return False
+    
+    with src, zipf.open(zinfo, 'w') as dst:
+        shutil.copyfileobj(src, dst, STREAM_BLOCK_SIZE)
+    return True
+
+def _write_zip(backup_path: Path, local_path: Path, entries: Iterable[os.DirEntry],
+               compresslevel: Optional[int], jobs: int, progress_bar: tqdm,
+               codec: str = "deflate") -> int:
+    """
+    Writes the backup as a ZIP file, compressing the files in a thread pool
+    
+    With the zstd codec the entries are compressed by zipfile itself while
+    they are streamed; with the store codec nothing is compressed.
+    
+    Args:
+        backup_path: Path of the ZIP file to create
+        local_path: Directory to back up
+        entries: Files to add, as returned by _iter_files
+        compresslevel: Compression level of the codec (None for its default)
+        jobs: Number of compression threads
+        progress_bar: Progress bar (in bytes) updated as files are written
+        codec: Compression of the entries, one of ZIP_CODECS (default: deflate)
+        
+    Returns:
+        int: Number of files added
+    """
+    stream_type = zipfile.ZIP_ZSTANDARD if codec == "zstd" else zipfile.ZIP_DEFLATED
+    
+    with open(backup_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as output, \
+            zipfile.ZipFile(output, 'w', stream_type, compresslevel=compresslevel) as zipf, \
+            ThreadPoolExecutor(max_workers=jobs) as executor:
+        # Relative paths in the ZIP are sliced off the entry paths, which
+        # all start with the base path and a separator
+        prefix_len = len(os.fspath(local_path)) + 1
+        
+        # Whether compressed data can be appended by _write_compressed
+        precompress = _can_write_compressed(zipf)
+        
+        # File counter
+        file_count = 0
+        
+        # Batches being compressed, written in the same order the files
+        # were found (bounded so that only a few are kept in memory)
+        pending = deque()
+        
+        # Small files are compressed in batches so that the cost of handing
+        # work to the pool is not paid for every file
+        batch = []
+        batch_size = 0
+        
+        def submit_batch():
+            future = executor.submit(_compress_batch, [item for item in batch if item[2] == _DEFLATE], compresslevel)
+            pending.append((list(batch), future))
+            batch.clear()
+        
+        def write_next():
+            nonlocal file_count
+            items, future = pending.popleft()
+            compressed = iter(future.result())
+            for file_path, zinfo, mode in items:
+                if mode == _DEFLATE:
+                    result = next(compressed)
+                    written = result is not None
+                    if written:
+                        _write_compressed(zipf, *result)
+                elif mode == _STORE:
+                    written = _write_streamed(zipf, file_path, zinfo, zipfile.ZIP_STORED)
+                else:
+                    written = _write_streamed(zipf, file_path, zinfo, stream_type, compresslevel)
+                # Files that vanished since the scan are not counted
+                if written:
+                    file_count += 1
+            progress_bar.update(sum(zinfo.file_size for _, zinfo, _ in items))
+        
+        # Add files to the ZIP
+        for entry in entries:
+            file_path = entry.path
+            # Relative path for the file in the ZIP
+            rel_path = _arcname(file_path, prefix_len)
+            
+            # The stat is cached by the DirEntry (also used for the progress total),
+            # the entry is built from it instead of statting the file again
+            zinfo = _zip_info(rel_path, entry.stat())
+            size = zinfo.file_size
+            if codec == "store" or os.path.splitext(entry.name)[1].lower() in STORED_EXTENSIONS:
+                # Already compressed (or no compression wanted), copied as it is when its turn comes
+                mode = _STORE
+            elif size < STORE_MAX_SIZE:
+                # Too small to gain anything from compression
+                mode = _STORE
+            elif codec == "zstd" or size > PARALLEL_MAX_FILE_SIZE or not precompress:
+                # Compressed by zipfile while it is streamed in blocks (zstd, too
+                # large to be compressed in memory, or no way to append it compressed)
+                mode = _STREAM
+            else:
+                # Compressed in a worker thread
+                mode = _DEFLATE
+                batch_size += size
+            batch.append((file_path, zinfo, mode))
+            
+            if len(batch) >= BATCH_MAX_FILES or batch_size >= BATCH_MAX_BYTES:
+                submit_batch()
+                batch_size = 0
+                if len(pending) >= jobs * 2:
+                    write_next()
+        
+        if batch:
+            submit_batch()
+        while pending:
+            write_next()
+    
+    return file_count
+
+def _write_tar_zst(backup_path: Path, local_path: Path, entries: Iterable[os.DirEntry],
+                   level: Optional[int], jobs: int, progress_bar: tqdm) -> int:
+    """
+    Writes the backup as a tar archive compressed with zstd
+    
+    zstd compresses the tar stream in its own worker threads, which is
+    considerably faster than DEFLATE for the same ratio. libarchive is
+    used when installed (python-libarchive-c), since it reads and
+    compresses the files without going through Python; otherwise the
+    archive is built with tarfile and zstandard. Both write the PAX format,
+    so long paths and files over 8 GiB are stored the same way either way.
+    
+    Args:
+        backup_path: Path of the .tar.zst file to create
+        local_path: Directory to back up
+        entries: Files to add, as returned by _iter_files
+        level: zstd compression level (None for ZSTD_DEFAULT_LEVEL)
+        jobs: Number of compression threads
+        progress_bar: Progress bar (in bytes) updated as files are written
+        
+    Returns:
+        int: Number of files added
+    """
+    level = ZSTD_DEFAULT_LEVEL if level is None else level
+    prefix_len = len(os.fspath(local_path)) + 1
+    file_count = 0
+    # Bytes written since the last progress bar update
+    written_bytes = 0
+    
+    try:
+        import libarchive
+    except ImportError:
+        libarchive = None
+    
+    if libarchive is not None:
+        options = f"zstd:compression-level={level},zstd:threads={jobs}"
+        with libarchive.file_writer(str(backup_path), 'pax_restricted', 'zstd', options=options) as archive:
+            for entry in entries:
+                try:
+                    archive.add_files(entry.path, pathname=_arcname(entry.path, prefix_len), recursive=False)
+                except libarchive.ArchiveError as e:
+                    # The file can't be stat'ed or opened any more (e.g. deleted since the scan)
+                    print(f"⚠️ Skipping {entry.path}: {e}")
+                    continue
+                file_count += 1
+                written_bytes += entry.stat().st_size
+                if file_count % PROGRESS_UPDATE_FILES == 0:
+                    progress_bar.update(written_bytes)
+                    written_bytes = 0
+        progress_bar.update(written_bytes)
+        return file_count
+    
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("The tar.zst format requires the 'zstandard' package (pip install zstandard)")
+    
+    compressor = zstandard.ZstdCompressor(level=level, threads=jobs)
+    
+    with open(backup_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as output, \
+            compressor.stream_writer(output) as stream, \
+            tarfile.open(fileobj=stream, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+        for entry in entries:
+            # Relative path for the file in the archive
+            rel_path = _arcname(entry.path, prefix_len)
+            
+            # The file is stat'ed and opened before its header is written, so a
+            # file deleted since the scan is skipped without breaking the stream
+            try:
+                tarinfo = tar.gettarinfo(entry.path, arcname=rel_path)
+                src = open(entry.path, 'rb') if tarinfo.isreg() else None
+            except OSError as e:
+                print(f"⚠️ Skipping {entry.path}: {e}")
+                continue
+            if src is None:
+                tar.addfile(tarinfo)
+            else:
+                with src:
+                    tar.addfile(tarinfo, src)
+            file_count += 1
+            written_bytes += entry.stat().st_size
+            if file_count % PROGRESS_UPDATE_FILES == 0:
+                progress_bar.update(written_bytes)
+                written_bytes = 0
+    
+    progress_bar.update(written_bytes)
+    return file_count
+
+def create_full_backup(site_alias: Optional[str] = None, output_dir: Optional[str] = None,
+                       compresslevel: Optional[int] = None, jobs: Optional[int] = None,
+                       archive_format: str = "zip", show_progress_total: bool = False,
+                       codec: str = "deflate") -> str:
     """
     Creates a complete backup of the application directory in ZIP format
-    without applying any exclusions.
+    (or tar.zst) without applying any exclusions.
     
     Args:
         site_alias: Alias of the site to backup
         output_dir: Directory where to save the backup (optional)
+        compresslevel: Compression level, from 0 to 9 for DEFLATE or 1 to 22 for
+                       zstd (optional, codec default if not specified)
+        jobs: Number of compression threads (optional, number of CPUs if not specified)
+        archive_format: Format of the backup, one of ARCHIVE_FORMATS (default: zip)
+        show_progress_total: Scan the files first so the progress bar shows the total
+                             size (default: False, the archive is written while scanning
+                             and only the throughput is shown; ignored on network filesystems)
+        codec: Compression of the ZIP entries, one of ZIP_CODECS (default: deflate,
+               not used for tar.zst, which is always compressed with zstd)
         
     Returns:
-        str: Path of the created ZIP file
+        str: Path of the created backup file
     """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unsupported backup format: {archive_format}")
+    if codec not in ZIP_CODECS:
+        raise ValueError(f"Unsupported compression codec: {codec}")
+    if archive_format == "zip" and codec == "zstd" and not hasattr(zipfile, "ZIP_ZSTANDARD"):
+        raise ValueError("zstd compressed ZIP files require Python 3.14 or later, use the tar.zst format instead")
+    
     config = get_yaml_config()
     
     # Select the site if an alias is provided
@@ -33,15 +597,16 @@ def create_full_backup(site_alias: Optional[str] = None, output_dir: Optional[st
         print(f"🔍 Selected site: {site_alias}")
     
     # Get the local path of the site
-    local_path = Path(config.get("ssh", "local_path"))
+    local_path_str = config.get("ssh", "local_path")
     
-    if not local_path.exists():
-        raise ValueError(f"The local path does not exist: {local_path}")
+    if not local_path_str or not os.path.isdir(local_path_str):
+        raise ValueError(f"The local path does not exist: {local_path_str}")
+    local_path = Path(local_path_str)
     
     # Generate filename with timestamp
     timestamp = time.strftime("%Y%m%d-%H%M%S")
     site_name = site_alias or config.get_default_site() or "wordpress"
-    backup_filename = f"{site_name}_backup_{timestamp}.zip"
+    backup_filename = f"{site_name}_backup_{timestamp}.{archive_format}"
     
     # Determine output directory
     if output_dir:
@@ -52,50 +617,45 @@ def create_full_backup(site_alias: Optional[str] = None, output_dir: Optional[st
     # Create the directory if it doesn't exist
     backup_dir.mkdir(parents=True, exist_ok=True)
     
-    # Full path of the ZIP file
+    # Full path of the backup file
     backup_path = backup_dir / backup_filename
     
     print(f"📦 Creating complete backup without exclusions...")
     print(f"   Source: {local_path}")
     print(f"   Destination: {backup_path}")
     
-    # First count total files for the progress bar
-    total_files = 0
-    for _, _, files in os.walk(local_path):
-        total_files += len(files)
+    if show_progress_total and is_network_filesystem(local_path):
+        print("ℹ️ Network filesystem detected, files will not be scanned in advance")
+        show_progress_total = False
     
-    print(f"🔄 Processing {total_files} files...")
+    if show_progress_total:
+        # Scan the tree once; the sizes of the entries give the progress bar
+        # total, and the entries (with their cached stat) are reused to write the archive
+        entries = list(_iter_files(str(local_path)))
+        total_bytes = sum(entry.stat().st_size for entry in entries)
+        print(f"🔄 Processing {len(entries)} files ({total_bytes / (1024 * 1024):.1f} MB)...")
+        progress_bar = tqdm(total=total_bytes, unit='B', unit_scale=True, unit_divisor=1024,
+                            desc="Compressing", mininterval=0.5)
+    else:
+        # Files are written while the tree is scanned in the background,
+        # the progress bar only shows the rate
+        entries = _scan_in_background(str(local_path))
+        print(f"🔄 Processing files...")
+        progress_bar = tqdm(unit='B', unit_scale=True, unit_divisor=1024, desc="Compressing", mininterval=0.5)
     
-    # Create the ZIP file
-    with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Get the base path to store relative paths in the ZIP
-        base_path = local_path
-        
-        # File counter
-        file_count = 0
-        
-        progress_bar = tqdm(total=total_files, unit='files', desc="Compressing")
-        
-        # Loop through all files and directories
-        for root, _, files in os.walk(local_path):
-            # Add files to the ZIP
-            for file in files:
-                file_path = Path(root) / file
-                # Relative path for the file in the ZIP
-                rel_path = file_path.relative_to(base_path)
-                
-                # Add file to the ZIP
-                zipf.write(file_path, rel_path)
-                file_count += 1
-                
-                # Update progress bar
-                progress_bar.update(1)
-        
+    jobs = jobs or os.cpu_count() or 1
+    
+    try:
+        if archive_format == "tar.zst":
+            file_count = _write_tar_zst(backup_path, local_path, entries, compresslevel, jobs, progress_bar)
+        else:
+            file_count = _write_zip(backup_path, local_path, entries, compresslevel, jobs, progress_bar, codec)
+    finally:
         # Close the progress bar
         progress_bar.close()
     
     print(f"✅ Backup completed: {file_count} files")
-    print(f"📦 ZIP file created: {backup_path}")
+    print(f"📦 {'ZIP' if archive_format == 'zip' else 'Archive'} file created: {backup_path}")
     
     # Return the backup path
     return str(backup_path) 
\ No newline at end of file
@@ -13,7 +13,7 @@ import re
 import subprocess
 import shutil
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 
 from config_yaml import get_yaml_config
 from utils.ssh import SSHClient
@@ -25,18 +25,19 @@ class DatabaseSynchronizer:
     Class to synchronize databases between environments
     """
     
-    def __init__(self, verbose=False):
+    def __init__(self, verbose=False, config=None):
         """
         Initializes the database synchronizer
         
         Args:
             verbose: If True, displays detailed debug messages
+            config: Already loaded configuration (optional, loaded if not provided)
         """
         # Save verbosity level
         self.verbose = verbose
         
         # Load configuration using the site system
-        config_obj = get_yaml_config(verbose=self.verbose)
+        config_obj = config if config is not None else get_yaml_config(verbose=self.verbose)
         
         # Default values in case configuration can't be loaded
         self.remote_host = "example-server"
@@ -682,13 +683,17 @@ class DatabaseSynchronizer:
             print("✅ Database imported successfully to the remote server")
             return True
 
-    def sync(self, direction: str = "from-remote", dry_run: bool = False) -> bool:
+    def sync(self, direction: str = "from-remote", dry_run: bool = False,
+             before_import: Optional[Callable[[], bool]] = None) -> bool:
         """
         Synchronizes the database between environments
         
         Args:
             direction: Synchronization direction ("from-remote" or "to-remote")
             dry_run: If True, only shows what would be done
+            before_import: Called once the remote database is downloaded and before it
+                          is imported locally (from-remote only); the synchronization
+                          stops if it returns False
             
         Returns:
             bool: True if the synchronization was successful, False otherwise
@@ -732,11 +737,21 @@ class DatabaseSynchronizer:
             sql_file = self.export_remote_db()
             if not sql_file:
                 return False
+            
+            # Wait for whatever the import depends on (e.g. the WordPress files)
+            if before_import is not None and not before_import():
+                print("❌ Database not imported: the previous step failed")
+                print(f"   The exported database remains in {sql_file}")
+                return False
                 
             # 2. Import to local (without modifying the file)
             success = self.import_to_local(sql_file)
             if not success:
                 return False
+            
+            # The imported options replace the applied media configuration
+            from commands.media import invalidate_media_state
+            invalidate_media_state(self.local_path)
                 
             # 3. Replace URLs using wp-cli (after importing)
             print(f"🔄 Replacing URLs in the database...")
@@ -872,6 +887,10 @@ class DatabaseSynchronizer:
             success = self.import_to_remote(sql_file)
             if not success:
                 return False
+            
+            # The imported options replace the applied media configuration
+            from commands.media import invalidate_media_state
+            invalidate_media_state(self.local_path, True, self.remote_host, self.remote_path)
                 
             # 3. Replace URLs on the server
             print(f"🔄 Replacing URLs on the remote server...")
@@ -927,7 +946,8 @@ class DatabaseSynchronizer:
                 
             return success
             
-def sync_database(direction: str = "from-remote", dry_run: bool = False, verbose: bool = False) -> bool:
+def sync_database(direction: str = "from-remote", dry_run: bool = False, verbose: bool = False, config=None,
+                  before_import: Optional[Callable[[], bool]] = None) -> bool:
     """
     Synchronizes the database between environments
     
@@ -935,9 +955,11 @@ def sync_database(direction: str = "from-remote", dry_run: bool = False, verbose
         direction: Synchronization direction ("from-remote" or "to-remote")
         dry_run: If True, only shows what would be done
         verbose: If True, displays detailed debug messages
+        config: Already loaded configuration (optional, loaded if not provided)
+        before_import: Called before importing a downloaded database (see DatabaseSynchronizer.sync)
         
     Returns:
         bool: True if the synchronization was successful, False otherwise
     """
-    synchronizer = DatabaseSynchronizer(verbose=verbose)
-    return synchronizer.sync(direction=direction, dry_run=dry_run) 
\ No newline at end of file
+    synchronizer = DatabaseSynchronizer(verbose=verbose, config=config)
+    return synchronizer.sync(direction=direction, dry_run=dry_run, before_import=before_import) 
\ No newline at end of file
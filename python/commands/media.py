@@ -8,35 +8,257 @@ using the 'WP Original Media Path' plugin.
 
 import os
 import sys
-import subprocess
 import time
+import contextlib
+import hashlib
+import json
 from pathlib import Path
 from typing import Optional, Tuple, Dict
 
 from utils.wp_cli import (
-    run_wp_cli,
-    update_option,
-    flush_cache,
-    is_plugin_installed,
-    install_plugin,
-    activate_plugin,
+    Session,
+    WPContext,
+    resolve_executable,
+    get_options_bulk,
+    update_options_bulk,
+    ensure_plugin,
     is_wordpress_installed
 )
-from config_yaml import get_yaml_config, get_nested
+from utils.filesystem import get_cache_dir
+from config_yaml import get_yaml_config
 
 # Required plugin for original media
 MEDIA_PLUGIN = "wp-original-media-path"
 MEDIA_PLUGIN_URL = "https://downloads.wordpress.org/plugin/wp-original-media-path.latest-stable.zip"
 
+# Seconds during which a "running" DDEV status is trusted without checking again
+DDEV_STATUS_TTL = 30
+
 # Memory limit for WP-CLI
 WP_CLI_MEMORY_LIMIT = "256M"
 
+# Options managed by the plugin, read back to show the configuration
+MEDIA_OPTIONS = ["upload_url_path", "owmp_path", "owmp_expert_bool"]
+
+def _ddev_state_file(project_dir: Path) -> Path:
+    """
+    Gets the file where the DDEV status of a project is cached
+    
+    Args:
+        project_dir: DDEV project directory
+        
+    Returns:
+        Path: Path of the state file
+    """
+    project_path = os.path.abspath(str(project_dir))
+    path_hash = hashlib.sha1(project_path.encode("utf-8")).hexdigest()[:8]
+    return get_cache_dir() / f"ddev-{os.path.basename(project_path)}-{path_hash}.state"
+
+def _is_ddev_running_cached(project_dir: Path) -> bool:
+    """
+    Checks if DDEV was seen running recently for a project
+    
+    Args:
+        project_dir: DDEV project directory
+        
+    Returns:
+        bool: True if the cached status is "running" and within DDEV_STATUS_TTL
+    """
+    try:
+        state_file = _ddev_state_file(project_dir)
+        if time.time() - state_file.stat().st_mtime > DDEV_STATUS_TTL:
+            return False
+        return state_file.read_text().strip() == "running"
+    except OSError:
+        return False
+
+def _write_ddev_state(project_dir: Path, running: bool) -> None:
+    """
+    Caches the DDEV status of a project, or invalidates it if not running
+    
+    Args:
+        project_dir: DDEV project directory
+        running: Whether DDEV is running
+    """
+    try:
+        state_file = _ddev_state_file(project_dir)
+        if running:
+            state_file.write_text("running")
+        elif state_file.exists():
+            state_file.unlink()
+    except OSError:
+        # The cache is only an optimization
+        pass
+
+def _print_media_options(values: Optional[Dict], url_label: str, missing: str) -> None:
+    """
+    Prints the media options read with get_options_bulk
+    
+    Args:
+        values: Option values by name (None if they could not be read)
+        url_label: Label for the media URL line
+        missing: Text shown for options that are not configured
+    """
+    values = values or {}
+    expert = "Enabled" if str(values.get("owmp_expert_bool")) == "1" else "Disabled"
+    
+    print(f"   {url_label}: {values.get('upload_url_path') or missing}")
+    print(f"   Physical path: {values.get('owmp_path') or missing}")
+    print(f"   Expert mode: {expert}")
+
+def _applied_state_file(local_path: Path) -> Path:
+    """
+    Gets the file where the last applied media configuration is recorded
+    
+    Kept in the cache directory rather than in the project, so that no
+    untracked files are left in the site (where a sync could pick them up).
+    
+    Args:
+        local_path: Local path of the site
+        
+    Returns:
+        Path: Path of the state file (e.g. ~/.cache/wp_chariot/media-public-1a2b3c4d.state)
+    """
+    site_path = os.path.abspath(str(local_path))
+    path_hash = hashlib.sha1(site_path.encode("utf-8")).hexdigest()[:8]
+    return get_cache_dir() / f"media-{os.path.basename(site_path)}-{path_hash}.state"
+
+def _state_target(remote: bool, remote_host: Optional[str], remote_path: Optional[str]) -> str:
+    """
+    Gets the key that identifies where the media configuration is applied
+    
+    Args:
+        remote: Whether the configuration is applied on the remote server
+        remote_host: Remote host
+        remote_path: Remote path
+        
+    Returns:
+        str: "local" or "remote:<host>:<path>"
+    """
+    return f"remote:{remote_host}:{remote_path}" if remote else "local"
+
+def _media_state_hash(target: str, ddev_wp_path: str, media_url: str,
+                      expert_mode: bool, media_path: Optional[str]) -> str:
+    """
+    Computes a hash of the desired media configuration
+    
+    Returns:
+        str: SHA1 of the values that configure_media_path applies
+    """
+    state = "|".join([
+        target,
+        ddev_wp_path,
+        media_url or "",
+        media_path or "",
+        "1" if expert_mode else "0",
+        MEDIA_PLUGIN,
+        MEDIA_PLUGIN_URL,
+    ])
+    return hashlib.sha1(state.encode("utf-8")).hexdigest()
+
+def _media_state_matches(ctx: WPContext, media_url: str, expert_mode: bool,
+                         media_path: Optional[str]) -> bool:
+    """
+    Checks that the site still has the media configuration recorded as applied
+    
+    The recorded state only says what was applied from this machine; the
+    database may have been replaced or edited since. The plugin status and
+    the media options are read back with a single WP-CLI call.
+    
+    Args:
+        ctx: Arguments of the WP-CLI calls
+        media_url: Media URL from the configuration
+        expert_mode: Indicates if expert mode should be activated
+        media_path: Physical media path (expert mode only)
+        
+    Returns:
+        bool: True if the site matches the configuration, False if it doesn't or can't be read
+    """
+    values = get_options_bulk(MEDIA_OPTIONS + ["active_plugins"], *ctx)
+    if values is None:
+        return False
+    
+    active_plugins = values.get("active_plugins") or []
+    if isinstance(active_plugins, dict):
+        active_plugins = list(active_plugins.values())
+    if not any(str(plugin).split("/")[0] == MEDIA_PLUGIN for plugin in active_plugins):
+        return False
+    
+    if media_url and values.get("upload_url_path") != media_url:
+        return False
+    if str(values.get("owmp_expert_bool") or "0") != ("1" if expert_mode else "0"):
+        return False
+    if expert_mode and media_path and values.get("owmp_path") != media_path:
+        return False
+    return True
+
+def _read_applied_state(local_path: Path) -> Dict[str, str]:
+    """
+    Reads the hashes of the last applied media configuration per target
+    
+    Args:
+        local_path: Local path of the site
+        
+    Returns:
+        Dict[str, str]: Map of target to state hash (empty if not available)
+    """
+    try:
+        with open(_applied_state_file(local_path), "r") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _record_applied_state(local_path: Path, target: str, state_hash: Optional[str]) -> None:
+    """
+    Records (or forgets, if state_hash is None) the media configuration applied to a target
+    
+    Args:
+        local_path: Local path of the site
+        target: Target key (see _state_target)
+        state_hash: Hash of the applied configuration, or None to forget it
+    """
+    state = _read_applied_state(local_path)
+    if state_hash is None:
+        if target not in state:
+            return
+        del state[target]
+    else:
+        state[target] = state_hash
+    
+    try:
+        state_file = _applied_state_file(local_path)
+        with open(state_file, "w") as f:
+            json.dump(state, f)
+    except OSError:
+        # The state is only used to skip work that is already done
+        pass
+
+def invalidate_media_state(local_path: Path, remote: bool = False,
+                           remote_host: Optional[str] = None, remote_path: Optional[str] = None) -> None:
+    """
+    Forgets the media configuration applied to a target
+    
+    Must be called when the WordPress options of the target are replaced,
+    for example after importing a database, so that the next media-path
+    run applies the configuration again.
+    
+    Args:
+        local_path: Local path of the site
+        remote: Whether the target is the remote server
+        remote_host: Remote host (only if remote=True)
+        remote_path: Remote path (only if remote=True)
+    """
+    _record_applied_state(local_path, _state_target(remote, remote_host, remote_path), None)
+
 def configure_media_path(
     media_url: Optional[str] = None,
     expert_mode: bool = False,
     media_path: Optional[str] = None,
     remote: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    force: bool = False,
+    config=None
 ) -> bool:
     """
     Configures the media path in WordPress
@@ -47,20 +269,29 @@ def configure_media_path(
         media_path: IGNORED - The value from config.yaml is used
         remote: Apply on the remote server instead of locally
         verbose: Show detailed information
+        force: Apply the configuration even if it was already applied
+        config: Already loaded configuration (optional, loaded if not provided)
         
     Returns:
         bool: True if the configuration was completed successfully, False otherwise
     """
     # Load configuration
-    config = get_yaml_config()
-    local_path = Path(get_nested(config, "ssh", "local_path"))
-    remote_host = get_nested(config, "ssh", "remote_host")
-    remote_path = get_nested(config, "ssh", "remote_path")
+    if config is None:
+        config = get_yaml_config()
+    
+    # Look up each section once
+    ssh_config = config.get("ssh") or {}
+    ddev_config = config.get("ddev") or {}
+    media_config = config.get("media") or {}
+    
+    local_path = Path(ssh_config.get("local_path"))
+    remote_host = ssh_config.get("remote_host")
+    remote_path = ssh_config.get("remote_path")
     
     # Get path inside DDEV container - explicitly require the two parameters
     # Fail fast: no compatibility with old formats
-    base_path = get_nested(config, "ddev", "base_path")
-    docroot = get_nested(config, "ddev", "docroot")
+    base_path = ddev_config.get("base_path")
+    docroot = ddev_config.get("docroot")
     
     if not base_path or not docroot:
         print("❌ Error: Incomplete DDEV configuration in sites.yaml")
@@ -76,7 +307,7 @@ def configure_media_path(
         print(f"ℹ️ Using WordPress path: {ddev_wp_path}")
     
     # ALWAYS get values from the configuration
-    media_url = get_nested(config, "media", "url", "")
+    media_url = media_config.get("url", "")
     if not media_url:
         print("⚠️ No media URL found in configuration")
         print("   Configure 'media.url' in config.yaml")
@@ -84,56 +315,135 @@ def configure_media_path(
         print("   Without a media URL, the default WordPress URL will be used")
     
     # Use expert mode according to configuration
-    expert_mode = get_nested(config, "media", "expert_mode", False)
+    expert_mode = media_config.get("expert_mode", False)
     media_path = None
     if expert_mode:
-        media_path = get_nested(config, "media", "path", "")
+        media_path = media_config.get("path", "")
         if not media_path:
             print("⚠️ Expert mode enabled but no physical path configured")
             print("   Configure 'media.path' in config.yaml")
             print("   Example: path: \"/absolute/path/to/uploads\"")
     
+    # Skip everything if this exact configuration was already applied and the
+    # site still has it (a stopped DDEV project fails the check and is started below)
+    target = _state_target(remote, remote_host, remote_path)
+    state_hash = _media_state_hash(target, ddev_wp_path, media_url, expert_mode, media_path)
+    if not force and _read_applied_state(local_path).get(target) == state_hash:
+        ctx = WPContext(local_path, remote, remote_host, remote_path, True, ddev_wp_path, WP_CLI_MEMORY_LIMIT)
+        if _media_state_matches(ctx, media_url, expert_mode, media_path):
+            print("✅ Media configuration is already up to date (use --force to apply it again)")
+            return True
+        if verbose:
+            print("ℹ️ The site no longer matches the recorded media configuration, applying it again")
+    
     # If we are in local environment, verify and ensure that DDEV is running
     if not remote:
+        # Only needed to manage DDEV in the local environment
+        import subprocess
+        
         try:
             print("🔍 Verifying DDEV status...")
-            ddev_status = subprocess.run(
-                ["ddev", "status"],
-                cwd=local_path.parent,
-                capture_output=True,
-                text=True
-            )
-            if "running" not in ddev_status.stdout.lower():
-                print("⚠️ DDEV is not running. Starting DDEV automatically...")
-                try:
-                    start_process = subprocess.run(
-                        ["ddev", "start"],
-                        cwd=local_path.parent,
-                        capture_output=True,
-                        text=True
-                    )
-                    if start_process.returncode == 0:
-                        print("✅ DDEV started correctly")
-                        # Add pause to ensure DDEV is fully ready
-                        print("⏳ Waiting 5 seconds to ensure DDEV is fully started...")
-                        time.sleep(5)
-                    else:
-                        print(f"⚠️ Could not start DDEV: {start_process.stderr}")
-                        print("   Continuing anyway, but errors may occur...")
-                except Exception as e:
-                    print(f"⚠️ Error when trying to start DDEV: {str(e)}")
-                    print("   Continuing with the installation...")
+            project_dir = local_path.parent
+            ddev = resolve_executable("ddev")
+            if _is_ddev_running_cached(project_dir):
+                if verbose:
+                    print(f"ℹ️ DDEV status cached as running (less than {DDEV_STATUS_TTL}s ago)")
+            else:
+                # Only stdout is inspected, and without decoding it
+                ddev_status = subprocess.run(
+                    [ddev, "status"],
+                    cwd=project_dir,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+                if b"running" in ddev_status.stdout.lower():
+                    _write_ddev_state(project_dir, True)
+                else:
+                    print("⚠️ DDEV is not running. Starting DDEV automatically...")
+                    try:
+                        # Show the start output only in verbose mode, keep errors for the report
+                        start_process = subprocess.run(
+                            [ddev, "start"],
+                            cwd=project_dir,
+                            stdout=None if verbose else subprocess.DEVNULL,
+                            stderr=subprocess.PIPE
+                        )
+                        if start_process.returncode == 0:
+                            print("✅ DDEV started correctly")
+                            # Add pause to ensure DDEV is fully ready
+                            print("⏳ Waiting 5 seconds to ensure DDEV is fully started...")
+                            time.sleep(5)
+                            _write_ddev_state(project_dir, True)
+                        else:
+                            _write_ddev_state(project_dir, False)
+                            print(f"⚠️ Could not start DDEV: {start_process.stderr.decode(errors='replace')}")
+                            print("   Continuing anyway, but errors may occur...")
+                    except Exception as e:
+                        _write_ddev_state(project_dir, False)
+                        print(f"⚠️ Error when trying to start DDEV: {str(e)}")
+                        print("   Continuing with the installation...")
         except Exception as e:
             print(f"⚠️ Could not verify DDEV status: {str(e)}")
             print("   Continuing with the installation...")
     
+    # Run all WP-CLI steps through a single DDEV shell when working locally
+    session = contextlib.nullcontext() if remote else Session(local_path)
+    with session:
+        success = _apply_media_configuration(
+            local_path,
+            remote,
+            remote_host,
+            remote_path,
+            ddev_wp_path,
+            media_url,
+            expert_mode,
+            media_path,
+            verbose
+        )
+    
+    if success:
+        _record_applied_state(local_path, target, state_hash)
+    
+    return success
+
+def _apply_media_configuration(
+    local_path: Path,
+    remote: bool,
+    remote_host: Optional[str],
+    remote_path: Optional[str],
+    ddev_wp_path: str,
+    media_url: str,
+    expert_mode: bool,
+    media_path: Optional[str],
+    verbose: bool
+) -> bool:
+    """
+    Installs the media plugin and applies the media options with WP-CLI
+    
+    Args:
+        local_path: Local path of the site
+        remote: Apply on the remote server instead of locally
+        remote_host: Remote host (only if remote=True)
+        remote_path: Remote path (only if remote=True)
+        ddev_wp_path: WordPress path inside the DDEV container
+        media_url: Media URL from the configuration
+        expert_mode: Indicates if expert mode should be activated
+        media_path: Physical media path (expert mode only)
+        verbose: Show detailed information
+        
+    Returns:
+        bool: True if the configuration was completed successfully, False otherwise
+    """
+    # Arguments shared by all the WP-CLI calls below
+    ctx = WPContext(local_path, remote, remote_host, remote_path, True, ddev_wp_path, WP_CLI_MEMORY_LIMIT)
+    
     # WordPress verification before continuing
     print(f"🔍 Verifying WordPress installation...")
     if verbose:
         print(f"   Local path: {local_path}")
         print(f"   Path in DDEV container: {ddev_wp_path}")
     
-    if not is_wordpress_installed(local_path, remote, remote_host, remote_path, True, ddev_wp_path):
+    if not is_wordpress_installed(*ctx):
         print("⚠️ Could not verify a functional WordPress installation")
         print("   Verify that WordPress is correctly installed and configured")
         print("   Continuing anyway, but errors may occur...")
@@ -144,321 +454,73 @@ def configure_media_path(
     if expert_mode and media_path:
         print(f"   Physical path: {media_path} (Expert Mode)")
     
-    # 1. Check if the plugin is already installed
-    print(f"📋 Checking plugin '{MEDIA_PLUGIN}'...")
+    # 1-2. Install (if needed) and activate the plugin in a single WP-CLI call
+    print(f"📦 Installing and activating plugin '{MEDIA_PLUGIN}'...")
     
-    if is_plugin_installed(MEDIA_PLUGIN, local_path, remote, remote_host, remote_path, True, ddev_wp_path):
-        print(f"✅ Plugin '{MEDIA_PLUGIN}' is already installed")
-        
-        # Update the plugin if it's already installed
-        print(f"🔄 Updating plugin '{MEDIA_PLUGIN}'...")
-        update_result = install_plugin(
-            MEDIA_PLUGIN, 
-            local_path, 
-            remote, 
-            remote_host, 
-            remote_path,
-            True,
-            ddev_wp_path
-        )
-        
-        if update_result:
-            print(f"✅ Plugin '{MEDIA_PLUGIN}' updated successfully")
-        else:
-            print(f"ℹ️ Update of '{MEDIA_PLUGIN}' was not necessary or an error occurred")
+    if ensure_plugin(MEDIA_PLUGIN, *ctx):
+        print(f"✅ Plugin '{MEDIA_PLUGIN}' installed and activated")
     else:
-        print(f"📦 Installing plugin '{MEDIA_PLUGIN}'...")
+        print(f"❌ Error installing plugin '{MEDIA_PLUGIN}'")
+        print(f"🔄 Trying to install from URL: {MEDIA_PLUGIN_URL}")
         
         # Show command that would be executed for debugging
         if not remote:
-            debug_cmd = f"ddev wp plugin install {MEDIA_PLUGIN}"
+            debug_cmd = f"ddev wp plugin install {MEDIA_PLUGIN_URL} --activate --force"
         else:
-            debug_cmd = f"ssh {remote_host} 'cd {remote_path} && wp plugin install {MEDIA_PLUGIN}'"
+            debug_cmd = f"ssh {remote_host} 'cd {remote_path} && wp plugin install {MEDIA_PLUGIN_URL} --activate --force'"
         print(f"🔍 Command to execute: {debug_cmd}")
         
-        # Add pause to ensure WordPress is ready to install plugins
-        print("⏳ Ensuring WordPress is fully ready...")
-        time.sleep(3)
-        
-        install_result = install_plugin(
-            MEDIA_PLUGIN, 
-            local_path, 
-            remote, 
-            remote_host, 
-            remote_path,
-            True,
-            ddev_wp_path
-        )
-        
-        if not install_result:
+        # Try to install from URL
+        if not ensure_plugin(MEDIA_PLUGIN_URL, *ctx, force=True):
             print(f"❌ Error installing plugin '{MEDIA_PLUGIN}'")
-            print(f"🔄 Trying to install from URL: {MEDIA_PLUGIN_URL}")
-            
-            # Show command that would be executed for debugging
+            print("ℹ️ Possible solutions:")
+            print("   1. Verify that WordPress is correctly installed")
+            print("   2. Ensure that DDEV is running (ddev start)")
+            print("   3. Check Internet connectivity")
+            print("   4. Try to install the plugin manually:")
             if not remote:
-                debug_cmd = f"ddev wp plugin install {MEDIA_PLUGIN_URL}"
+                print(f"      $ ddev wp plugin install {MEDIA_PLUGIN_URL} --activate")
             else:
-                debug_cmd = f"ssh {remote_host} 'cd {remote_path} && wp plugin install {MEDIA_PLUGIN_URL}'"
-            print(f"🔍 Command to execute: {debug_cmd}")
+                print(f"      $ ssh {remote_host} 'cd {remote_path} && wp plugin install {MEDIA_PLUGIN_URL} --activate'")
             
-            # Additional pause before the second attempt
-            print("⏳ Waiting 5 seconds before retrying...")
-            time.sleep(5)
-            
-            # Try to install from URL
-            install_result = install_plugin(
-                MEDIA_PLUGIN_URL, 
-                local_path, 
-                remote, 
-                remote_host, 
-                remote_path,
-                True,
-                ddev_wp_path,
-                True  # Use URL
-            )
-            
-            if not install_result:
-                print(f"❌ Error installing plugin '{MEDIA_PLUGIN}'")
-                print("ℹ️ Possible solutions:")
-                print("   1. Verify that WordPress is correctly installed")
-                print("   2. Ensure that DDEV is running (ddev start)")
-                print("   3. Check Internet connectivity")
-                print("   4. Try to install the plugin manually:")
-                if not remote:
-                    print(f"      $ ddev wp plugin install {MEDIA_PLUGIN_URL}")
-                else:
-                    print(f"      $ ssh {remote_host} 'cd {remote_path} && wp plugin install {MEDIA_PLUGIN_URL}'")
-                
-                print("⚠️ Continuing without the plugin. Media configuration may not work correctly.")
-                return False
-            else:
-                print(f"✅ Plugin '{MEDIA_PLUGIN}' installed successfully")
-        else:
-            print(f"✅ Plugin '{MEDIA_PLUGIN}' installed successfully")
-    
-    # Pause before activating the plugin
-    print("⏳ Waiting 2 seconds before activating the plugin...")
-    time.sleep(2)
-    
-    # 2. Activate the plugin
-    print(f"🔌 Activating plugin '{MEDIA_PLUGIN}'...")
-    # Try to activate up to 3 times with small pauses
-    activate_success = False
-    for attempt in range(3):
-        activate_result = activate_plugin(
-            MEDIA_PLUGIN, 
-            local_path, 
-            remote, 
-            remote_host, 
-            remote_path,
-            True,
-            ddev_wp_path,
-            memory_limit=WP_CLI_MEMORY_LIMIT  # Use explicit memory limit
-        )
+            print("⚠️ Continuing without the plugin. Media configuration may not work correctly.")
+            return False
         
-        if activate_result:
-            activate_success = True
-            print(f"✅ Plugin '{MEDIA_PLUGIN}' activated successfully")
-            break
-        else:
-            if attempt < 2:  # Don't show in last attempt
-                print(f"⚠️ Attempt {attempt+1}/3 failed. Retrying...")
-                # Increase pause between attempts
-                print(f"⏳ Waiting {(attempt+1)*3} seconds before next attempt...")
-                time.sleep((attempt+1) * 3)
-    
-    if not activate_success:
-        print(f"⚠️ Could not activate plugin '{MEDIA_PLUGIN}'. Continuing anyway...")
-        print(f"   It's possible you need to activate it manually from the WordPress panel.")
-        print(f"   Or review errors using 'wp plugin activate {MEDIA_PLUGIN} --debug'")
+        print(f"✅ Plugin '{MEDIA_PLUGIN}' installed and activated")
     
     # 3. Get current configuration
     if verbose:
         print("🔍 Current configuration:")
-        cmd = ["option", "get", "upload_url_path", "--skip-themes", "--skip-plugins"]
-        code, stdout, stderr = run_wp_cli(
-            cmd, 
-            local_path, 
-            remote, 
-            remote_host, 
-            remote_path, 
-            True, 
-            ddev_wp_path,
-            memory_limit=WP_CLI_MEMORY_LIMIT
-        )
-        current_url = stdout.strip() if code == 0 and stdout.strip() else "Not configured"
-        
-        # Clean memory error messages in the output
-        if "Failed to set memory limit" in current_url:
-            current_url = current_url.split("\n")[-1].strip()
-        
-        cmd = ["option", "get", "owmp_path", "--skip-themes", "--skip-plugins"]
-        code, stdout, stderr = run_wp_cli(
-            cmd, 
-            local_path, 
-            remote, 
-            remote_host, 
-            remote_path, 
-            True, 
-            ddev_wp_path,
-            memory_limit=WP_CLI_MEMORY_LIMIT
-        )
-        current_path = stdout.strip() if code == 0 and stdout.strip() else "Not configured"
-        
-        # Clean memory error messages in the output
-        if "Failed to set memory limit" in current_path:
-            current_path = current_path.split("\n")[-1].strip()
-        
-        cmd = ["option", "get", "owmp_expert_bool", "--skip-themes", "--skip-plugins"]
-        code, stdout, stderr = run_wp_cli(
-            cmd, 
-            local_path, 
-            remote, 
-            remote_host, 
-            remote_path, 
-            True, 
-            ddev_wp_path,
-            memory_limit=WP_CLI_MEMORY_LIMIT
-        )
-        current_expert = stdout.strip() if code == 0 and stdout.strip() else "0"
-        
-        # Clean memory error messages in the output
-        if "Failed to set memory limit" in current_expert:
-            current_expert = current_expert.split("\n")[-1].strip()
-            
-        print(f"   Current URL: {current_url}")
-        print(f"   Physical path: {current_path}")
-        print(f"   Expert mode: {'Enabled' if current_expert == '1' else 'Disabled'}")
+        _print_media_options(get_options_bulk(MEDIA_OPTIONS, *ctx), "Current URL", "Not configured")
     
     # 4. Configure media URL
+    options = {}
     if media_url:
         print(f"🔧 Configuring media URL to: {media_url}")
-        update_option(
-            "upload_url_path", 
-            media_url, 
-            local_path, 
-            remote, 
-            remote_host, 
-            remote_path,
-            True,
-            ddev_wp_path,
-            memory_limit=WP_CLI_MEMORY_LIMIT
-        )
+        options["upload_url_path"] = media_url
     
     # 5. Configure expert mode if requested
     if expert_mode:
         print("⚙️ Activating expert mode for custom path")
-        update_option(
-            "owmp_expert_bool", 
-            "1", 
-            local_path, 
-            remote, 
-            remote_host, 
-            remote_path,
-            True,
-            ddev_wp_path,
-            memory_limit=WP_CLI_MEMORY_LIMIT
-        )
+        options["owmp_expert_bool"] = "1"
         
         if media_path:
             print(f"🔧 Configuring physical path to: {media_path}")
-            update_option(
-                "owmp_path", 
-                media_path, 
-                local_path, 
-                remote, 
-                remote_host, 
-                remote_path,
-                True,
-                ddev_wp_path,
-                memory_limit=WP_CLI_MEMORY_LIMIT
-            )
+            options["owmp_path"] = media_path
     else:
         # Ensure that expert mode is disabled
-        update_option(
-            "owmp_expert_bool", 
-            "0", 
-            local_path, 
-            remote, 
-            remote_host, 
-            remote_path,
-            True,
-            ddev_wp_path,
-            memory_limit=WP_CLI_MEMORY_LIMIT
-        )
+        options["owmp_expert_bool"] = "0"
     
-    # 6. Clear cache
+    # 6. Clear cache (applied together with the options in a single WP-CLI call)
     print("🧹 Clearing WordPress cache...")
-    flush_cache(
-        local_path, 
-        remote, 
-        remote_host, 
-        remote_path,
-        True,
-        ddev_wp_path,
-        memory_limit=WP_CLI_MEMORY_LIMIT
-    )
+    if not update_options_bulk(options, *ctx, flush=True):
+        print("❌ Error applying the media options")
+        return False
     
     # 7. Verify final configuration
     print("\n📊 Final configuration:")
     
-    # Media URL
-    cmd = ["option", "get", "upload_url_path", "--skip-themes", "--skip-plugins"]
-    code, stdout, stderr = run_wp_cli(
-        cmd, 
-        local_path, 
-        remote, 
-        remote_host, 
-        remote_path, 
-        True, 
-        ddev_wp_path,
-        memory_limit=WP_CLI_MEMORY_LIMIT
-    )
-    final_url = stdout.strip() if code == 0 and stdout.strip() else "Not configured (using default value)"
-    
-    # Clean memory error messages in the output
-    if "Failed to set memory limit" in final_url:
-        final_url = final_url.split("\n")[-1].strip()
-    
-    # Physical path
-    cmd = ["option", "get", "owmp_path", "--skip-themes", "--skip-plugins"]
-    code, stdout, stderr = run_wp_cli(
-        cmd, 
-        local_path, 
-        remote, 
-        remote_host, 
-        remote_path, 
-        True, 
-        ddev_wp_path,
-        memory_limit=WP_CLI_MEMORY_LIMIT
-    )
-    final_path = stdout.strip() if code == 0 and stdout.strip() else "Not configured (using default value)"
-    
-    # Clean memory error messages in the output
-    if "Failed to set memory limit" in final_path:
-        final_path = final_path.split("\n")[-1].strip()
-    
-    # Expert mode
-    cmd = ["option", "get", "owmp_expert_bool", "--skip-themes", "--skip-plugins"]
-    code, stdout, stderr = run_wp_cli(
-        cmd, 
-        local_path, 
-        remote, 
-        remote_host, 
-        remote_path, 
-        True, 
-        ddev_wp_path,
-        memory_limit=WP_CLI_MEMORY_LIMIT
-    )
-    final_expert = "Enabled" if code == 0 and stdout.strip() == "1" else "Disabled"
-    
-    # Clean memory error messages in the output
-    if "Failed to set memory limit" in stdout:
-        final_expert = "Enabled" if stdout.split("\n")[-1].strip() == "1" else "Disabled"
-    
-    print(f"   Media URL: {final_url}")
-    print(f"   Physical path: {final_path}")
-    print(f"   Expert mode: {final_expert}")
+    _print_media_options(get_options_bulk(MEDIA_OPTIONS, *ctx), "Media URL", "Not configured (using default value)")
     
     print("\n✅ Configuration completed successfully")
     print("🔍 Media files will now be looked for in the configured path")
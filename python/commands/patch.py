@@ -16,7 +16,7 @@ import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Union, Set
 
-from config_yaml import get_yaml_config, get_nested
+from config_yaml import get_yaml_config, get_nested, get_install_dir
 from utils.ssh import SSHClient
 from utils.filesystem import ensure_dir_exists, create_backup
 from utils.wp_cli import get_item_version_from_path
@@ -1086,7 +1086,7 @@ class PatchManager:
             print(f"     - Last update: {last_updated}")
         else:
             # Verify if the general file exists
-            generic_lock_file = Path(__file__).resolve().parent.parent / "patches.lock.json"
+            generic_lock_file = get_install_dir() / "patches.lock.json"
             if generic_lock_file.exists():
                 print(f"     - Status: Not exists (general: patches.lock.json will be used)")
             else:
@@ -14,7 +14,7 @@ import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Union, Set
 
-from config_yaml import get_yaml_config, get_nested
+from config_yaml import get_yaml_config, get_nested, get_install_dir
 from utils.ssh import SSHClient
 from utils.wp_cli import get_item_version_from_path
 
@@ -377,10 +377,10 @@ def get_site_specific_lock_file(site_name: Optional[str] = None) -> Path:
     """
     # If no specific site, use the generic file
     if not site_name:
-        return Path(__file__).resolve().parent.parent / "patches.lock.json"
+        return get_install_dir() / "patches.lock.json"
     
     # If there is a site, use a specific file
-    return Path(__file__).resolve().parent.parent / f"patches-{site_name}.lock.json"
+    return get_install_dir() / f"patches-{site_name}.lock.json"
 
 def load_lock_file(lock_file: Path) -> Dict:
     """
@@ -23,11 +23,14 @@ class FileSynchronizer:
     Class for synchronizing files between environments
     """
     
-    def __init__(self):
+    def __init__(self, config=None):
         """
         Initializes the file synchronizer
+        
+        Args:
+            config: Already loaded configuration (optional, loaded if not provided)
         """
-        self.config = get_yaml_config()
+        self.config = config if config is not None else get_yaml_config()
         
         # Load configuration
         self.remote_host = self.config.get("ssh", "remote_host")
@@ -695,7 +698,7 @@ class FileSynchronizer:
             
         print("✅ Local configuration adjustments completed")
 
-def sync_files(direction: str = "from-remote", dry_run: bool = False, clean: bool = True, skip_full_backup: bool = False) -> bool:
+def sync_files(direction: str = "from-remote", dry_run: bool = False, clean: bool = True, skip_full_backup: bool = False, config=None) -> bool:
     """
     Synchronizes files between environments
     
@@ -704,6 +707,7 @@ def sync_files(direction: str = "from-remote", dry_run: bool = False, clean: boo
         dry_run: If True, only simulates synchronization without making changes
         clean: If True, cleans excluded files after synchronization
         skip_full_backup: If True, skips creating a full backup before synchronizing from remote
+        config: Already loaded configuration (optional, loaded if not provided)
         
     Returns:
         bool: True if the synchronization was successful, False otherwise
@@ -726,7 +730,7 @@ def sync_files(direction: str = "from-remote", dry_run: bool = False, clean: boo
     # Now we use the skip_full_backup parameter instead.
     try:
         # Create synchronizer
-        synchronizer = FileSynchronizer()
+        synchronizer = FileSynchronizer(config=config)
         
         # Run synchronization
         return synchronizer.sync(direction=direction, dry_run=dry_run, clean=clean)
@@ -9,9 +9,217 @@ import os
 import sys
 import yaml
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import copy
+from collections import OrderedDict
 import re
+import tempfile
+import functools
+import marshal
+
+# Prefer the libyaml-backed C loader and dumper when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Main sections of the configuration, in the order they are written
+CONFIG_SECTIONS = ("ssh", "security", "database", "urls", "media", "exclusions", "protected_files")
+REQUIRED_SECTIONS = frozenset(CONFIG_SECTIONS)
+
+# Snapshot of the parsed files, shared between processes. Kept in the
+# wp_chariot cache directory unless WP_DEPLOY_CONFIG_CACHE points to another file
+_SNAPSHOT_PATH = os.environ.get("WP_DEPLOY_CONFIG_CACHE")
+_SNAPSHOT_NAME = "config-snapshot.marshal"
+_snapshot = None
+
+def _snapshot_file() -> str:
+    """
+    Returns the path of the snapshot of the parsed files
+    (e.g. ~/.cache/wp_chariot/config-snapshot.marshal)
+    """
+    if _SNAPSHOT_PATH:
+        return _SNAPSHOT_PATH
+    from utils.filesystem import get_cache_dir
+    return str(get_cache_dir() / _SNAPSHOT_NAME)
+
+def _is_private_file(path: str) -> bool:
+    """
+    Checks that a file is owned by the current user and not writable by anyone else
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        bool: True if only the current user could have written the file
+    """
+    st = os.stat(path)
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return False
+    return not st.st_mode & 0o022
+
+def _load_snapshot() -> Dict[str, Tuple[Tuple[int, int], Any]]:
+    """
+    Loads the snapshot on first use
+    
+    The snapshot is stored with marshal, which only holds plain values and
+    never runs code when loaded, and is ignored unless it is owned by the
+    current user and not writable by group or others.
+    
+    Returns:
+        Dict[str, Tuple[Tuple[int, int], Any]]: Parsed content by path, with the
+                                    modification time and size of the file it was parsed from
+    """
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = {}
+        try:
+            snapshot_file = _snapshot_file()
+            if not _is_private_file(snapshot_file):
+                print(f"⚠️ Ignoring the configuration cache: {snapshot_file} is not private to the current user")
+                return _snapshot
+            with open(snapshot_file, 'rb') as f:
+                data = marshal.load(f)
+            if isinstance(data, dict):
+                _snapshot = data
+        except Exception:
+            # Missing or unreadable: the files are parsed again
+            pass
+    return _snapshot
+
+def _store_snapshot(path: str, stamp: Tuple[int, int], data: Any):
+    """
+    Adds a parsed file to the snapshot and writes it atomically
+    
+    The snapshot is written to a temporary file (created readable only by
+    the current user) and renamed, so readers never see a partial snapshot.
+    
+    Args:
+        path: Path to the YAML file
+        stamp: Modification time (ns) and size of the parsed file
+        data: Parsed YAML content
+    """
+    snapshot = _load_snapshot()
+    snapshot[path] = (stamp, data)
+    try:
+        snapshot_file = _snapshot_file()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(snapshot_file)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump(snapshot, f)
+            os.replace(tmp_path, snapshot_file)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except Exception:
+        # The snapshot is an optimization only: a read-only home directory or
+        # values marshal cannot hold (such as dates) must not break configuration loading
+        pass
+
+# Parsed YAML files by path, with the (mtime_ns, size) they were parsed at,
+# in least recently used order
+_YAML_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+_YAML_CACHE_SIZE = 100
+
+def _parse_yaml_file(path: str, stamp: Tuple[int, int]) -> Any:
+    """
+    Parses a YAML file
+    
+    Between processes, the snapshot is used instead of the YAML file while
+    it was written for the same modification time and size of the YAML source.
+    """
+    cached = _load_snapshot().get(path)
+    if cached is not None and tuple(cached[0]) == tuple(stamp):
+        return cached[1]
+    
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+    _store_snapshot(path, stamp, data)
+    return data
+
+def _read_yaml_file(file_path) -> Any:
+    """
+    Reads a YAML file, reusing the parsed content while the file is unchanged
+    
+    A copy is returned so callers can merge and modify it freely
+    without altering the cached data.
+    
+    Args:
+        file_path: Path to the YAML file
+        
+    Returns:
+        Any: Parsed YAML content
+    """
+    path = os.path.abspath(file_path)
+    return copy.deepcopy(_cached_load(path))
+
+def _cached_load(path: str) -> Any:
+    """
+    Gets the parsed content of a YAML file from the in-process cache
+    
+    The file is parsed again when its modification time or size changed.
+    The least recently used entry is dropped once the cache is full.
+    
+    Args:
+        path: Absolute path to the YAML file
+        
+    Returns:
+        Any: Parsed YAML content (shared, must not be modified)
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _YAML_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        _YAML_CACHE.move_to_end(path)
+        return cached[1]
+    
+    data = _parse_yaml_file(path, stamp)
+    _YAML_CACHE[path] = (stamp, data)
+    _YAML_CACHE.move_to_end(path)
+    if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+        _YAML_CACHE.popitem(last=False)
+    return data
+
+@functools.lru_cache(maxsize=None)
+def get_install_dir() -> Path:
+    """
+    Gets the directory where the wp_chariot Python modules are installed
+    
+    Resolving __file__ follows every symlink in the path, so the directory
+    can be given with the WP_DEPLOY_INSTALL_DIR environment variable to
+    skip it. The result is computed once per process.
+    
+    Returns:
+        Path: Directory containing config_yaml.py (the "python" directory)
+    """
+    install_dir = os.environ.get("WP_DEPLOY_INSTALL_DIR")
+    if install_dir:
+        return Path(install_dir)
+    return Path(__file__).resolve().parent
+
+# Markers used by YAMLConfig.get: a path not memoized yet, and a path
+# memoized as missing from the configuration
+_GET_MISS = object()
+_NOT_FOUND = object()
+
+def _lookup(data: Any, path: Tuple[str, ...], default: Any = None) -> Any:
+    """
+    Walks a nested dictionary following a tuple of keys
+    
+    Args:
+        data: Nested dictionary
+        path: Keys to follow
+        default: Value returned if any key is missing
+        
+    Returns:
+        Any: Found value or default value
+    """
+    current = data
+    for key in path:
+        if not isinstance(current, dict) or key not in current:
+            return default
+        current = current[key]
+    return current
 
 class YAMLConfig:
     """
@@ -27,8 +235,12 @@ class YAMLConfig:
         """
         self.verbose = verbose
         self.config = {}
+        self._snapshot = None
+        self._ddev_paths = None
+        self._get_cache = None
         self.sites = {}
         self.current_site = None
+        self._current_site_config = None
         self.default_site = None
         
         # Detect project directory and deploy-tools
@@ -51,9 +263,8 @@ class YAMLConfig:
         Detects the directory structure of the project and deploy-tools
         """
         # Detect deploy-tools
-        current_file = Path(__file__).resolve()
         # config_yaml.py -> python -> deploy-tools
-        self.deploy_tools_dir = current_file.parent.parent
+        self.deploy_tools_dir = get_install_dir().parent
         
         # If we are running from within deploy-tools
         if "deploy-tools" in str(self.deploy_tools_dir):
@@ -84,10 +295,9 @@ class YAMLConfig:
         # Load global configuration if it exists
         if global_config_file.exists():
             try:
-                with open(global_config_file, 'r') as f:
-                    global_config = yaml.safe_load(f) or {}
-                    # Set the global configuration
-                    self.config = global_config
+                global_config = _read_yaml_file(global_config_file) or {}
+                # Set the global configuration
+                self.config = global_config
                 if self.verbose:
                     print(f"Global configuration loaded from: {global_config_file}")
             except Exception as e:
@@ -96,10 +306,9 @@ class YAMLConfig:
         # Load project configuration if it exists
         if project_config_file.exists():
             try:
-                with open(project_config_file, 'r') as f:
-                    project_config = yaml.safe_load(f) or {}
-                    # Merge with existing configuration
-                    self.merge_config(project_config)
+                project_config = _read_yaml_file(project_config_file) or {}
+                # Merge with existing configuration
+                self.merge_config(project_config)
                 if self.verbose:
                     print(f"Project configuration loaded from: {project_config_file}")
             except Exception as e:
@@ -113,9 +322,8 @@ class YAMLConfig:
         
         if sites_config_file.exists():
             try:
-                with open(sites_config_file, 'r') as f:
-                    sites_config = yaml.safe_load(f) or {}
-                    
+                sites_config = _read_yaml_file(sites_config_file) or {}
+                
                 # Extract the site list
                 self.sites = sites_config.get("sites", {})
                 self.default_site = sites_config.get("default", None)
@@ -146,17 +354,18 @@ class YAMLConfig:
         
         # Load the site configuration
         site_config = self.sites[site_alias]
+        self._current_site_config = site_config
         
         # Reset the current configuration to an empty dictionary
         self.config = {}
+        self.invalidate_snapshot()
         
         # Load global configuration
         global_config_file = self.deploy_tools_dir / "python" / "config.yaml"
         if global_config_file.exists():
             try:
-                with open(global_config_file, 'r') as f:
-                    global_config = yaml.safe_load(f) or {}
-                    self.config = global_config
+                global_config = _read_yaml_file(global_config_file) or {}
+                self.config = global_config
             except Exception:
                 pass
         
@@ -200,7 +409,7 @@ class YAMLConfig:
         if not site_alias:
             # If there is only one site, use it
             if len(self.sites) == 1:
-                site_alias = list(self.sites.keys())[0]
+                site_alias = next(iter(self.sites))
                 if self.verbose:
                     print(f"ℹ️ Single site selected automatically: {site_alias}")
             # If there are more than one and there is one by default, use that
@@ -222,12 +431,28 @@ class YAMLConfig:
                     print("ℹ️ No sites configured. Using current configuration.")
                 return True
         
-        # Attempt to set the selected site
+        # Attempt to set the selected site (unless it is already loaded)
         if site_alias:
+            if self._is_site_loaded(site_alias):
+                return True
             return self.set_current_site(site_alias)
         
         return True
     
+    def _is_site_loaded(self, site_alias) -> bool:
+        """
+        Checks if a site is the current one and its configuration hasn't changed since it was loaded
+        
+        Args:
+            site_alias: Alias of the site
+            
+        Returns:
+            bool: True if the configuration of the site is already loaded
+        """
+        return (site_alias == self.current_site
+                and self._current_site_config is not None
+                and self.sites.get(site_alias) is self._current_site_config)
+    
     def create_sites_config(self, default_site=None):
         """
         Creates an empty sites configuration file
@@ -253,7 +478,7 @@ class YAMLConfig:
         # Write configuration
         try:
             with open(sites_config_file, 'w') as f:
-                yaml.dump(template, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(template, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
             print(f"✅ Sites configuration file created: {sites_config_file}")
             return True
         except Exception as e:
@@ -296,7 +521,7 @@ class YAMLConfig:
         
         try:
             with open(sites_config_file, 'w') as f:
-                yaml.dump(template, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(template, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
             print(f"✅ Site '{alias}' added/updated correctly")
             
             if is_default:
@@ -343,7 +568,7 @@ class YAMLConfig:
         
         try:
             with open(sites_config_file, 'w') as f:
-                yaml.dump(template, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(template, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
             print(f"✅ Site '{alias}' removed correctly")
             return True
         except Exception as e:
@@ -418,10 +643,9 @@ class YAMLConfig:
             file_path: Path to the YAML file
         """
         try:
-            with open(file_path, 'r') as file:
-                if self.verbose:
-                    print(f"📝 Reading YAML file: {file_path}")
-                yaml_data = yaml.safe_load(file)
+            if self.verbose:
+                print(f"📝 Reading YAML file: {file_path}")
+            yaml_data = _read_yaml_file(file_path)
                 
             if yaml_data and isinstance(yaml_data, dict):
                 # Show main keys for debugging
@@ -441,6 +665,7 @@ class YAMLConfig:
                 
                 # Update the configuration recursively
                 self._update_dict_recursive(self.config, yaml_data)
+                self.invalidate_snapshot()
                 
                 # Verify that values were updated
                 if 'database' in yaml_data and 'remote' in yaml_data['database'] and self.verbose:
@@ -583,6 +808,7 @@ class YAMLConfig:
             if i == len(path) - 1:
                 # Last element: set the value
                 current[key] = value
+                self.invalidate_snapshot()
             else:
                 # Intermediate element: ensure the dictionary exists
                 if key not in current or not isinstance(current[key], dict):
@@ -593,6 +819,9 @@ class YAMLConfig:
         """
         Gets a configuration value according to a key path
         
+        Lookups are memoized like snapshot(); use set() (or call
+        invalidate_snapshot()) to change values after loading.
+        
         Args:
             *path: Key path to access the value
             default: Default value if the path is not found
@@ -600,12 +829,101 @@ class YAMLConfig:
         Returns:
             The configuration value or the default value
         """
-        current = self.config
-        for key in path:
-            if not isinstance(current, dict) or key not in current:
-                return default
-            current = current[key]
-        return current
+        if self._get_cache is None or self._get_cache[0] is not self.config:
+            self._get_cache = (self.config, {})
+        cache = self._get_cache[1]
+        
+        value = cache.get(path, _GET_MISS)
+        if value is _GET_MISS:
+            value = _lookup(self.config, path, _NOT_FOUND)
+            cache[path] = value
+        return default if value is _NOT_FOUND else value
+        
+    def set(self, *path: str, value: Any) -> None:
+        """
+        Sets a configuration value according to a key path, creating
+        the intermediate sections if needed
+        
+        Args:
+            *path: Key path of the value
+            value: Value to set
+        """
+        self._set_nested_value(self.config, path, value)
+        
+    def snapshot(self) -> Dict[Tuple[str, ...], Any]:
+        """
+        Gets a flattened view of the configuration keyed by key path
+        
+        Every node is included, so both ("ssh",) and ("ssh", "remote_host")
+        are keys. The result is memoized until the configuration is reloaded
+        or merged; call invalidate_snapshot() after modifying self.config directly.
+        
+        Returns:
+            Dict[Tuple[str, ...], Any]: Value of each key path
+        """
+        if self._snapshot is None or self._snapshot[0] is not self.config:
+            flat = {}
+            stack = [((), self.config)]
+            while stack:
+                prefix, node = stack.pop()
+                for key, value in node.items():
+                    path = prefix + (key,)
+                    flat[path] = value
+                    if isinstance(value, dict):
+                        stack.append((path, value))
+            self._snapshot = (self.config, flat)
+        return self._snapshot[1]
+        
+    def invalidate_snapshot(self):
+        """
+        Discards the memoized snapshot and derived values after the configuration changes
+        """
+        self._snapshot = None
+        self._ddev_paths = None
+        self._get_cache = None
+        
+    def get_ddev_paths(self) -> Tuple[str, str, str, str]:
+        """
+        Gets the paths needed to run WP-CLI through DDEV for the current site
+        
+        The result is memoized until the configuration is reloaded, merged
+        or another site is selected.
+        
+        Returns:
+            Tuple[str, str, str, str]: ddev.base_path, ddev.docroot, WordPress path
+            inside the container and DDEV project directory on the host
+            
+        Raises:
+            ValueError: If ssh.local_path, ddev.base_path or ddev.docroot are not configured
+        """
+        if self._ddev_paths is None:
+            local_path = (self.config.get("ssh") or {}).get("local_path")
+            if not local_path:
+                raise ValueError("No local path configuration found in sites.yaml")
+            
+            ddev_config = self.config.get("ddev")
+            if ddev_config is None:
+                raise ValueError("No ddev section found in sites.yaml")
+            
+            # Explicitly require both parameters (fail fast)
+            base_path = ddev_config.get("base_path")
+            docroot = ddev_config.get("docroot")
+            if base_path is None or docroot is None:
+                raise ValueError(
+                    "Complete DDEV configuration not found in sites.yaml\n"
+                    "   Both parameters are required:\n"
+                    "   - ddev.base_path: Base path inside container (e.g. \"/var/www/html\")\n"
+                    "   - ddev.docroot: Docroot directory (e.g. \"app/public\")"
+                )
+            
+            # Get project base directory
+            # Example: /home/user/proyecto/app/public -> /home/user/proyecto
+            # (plain strings: normpath drops trailing separators like Path would,
+            # and a relative path like app/public gives "." as Path would)
+            project_dir = os.path.dirname(os.path.dirname(os.path.normpath(local_path))) or "."  # Up two levels from app/public
+            
+            self._ddev_paths = (base_path, docroot, f"{base_path}/{docroot}", project_dir)
+        return self._ddev_paths
         
     def get_strict(self, *path: str) -> Any:
         """
@@ -682,22 +1000,41 @@ class YAMLConfig:
         """
         return self.config.get("media", {})
         
+    def get_expert_mode(self) -> bool:
+        """
+        Gets whether the media expert mode is enabled
+        
+        Returns:
+            bool: Value of media.expert_mode (False if not configured)
+        """
+        return self.get("media", "expert_mode", default=False)
+        
     def display(self):
         """
         Displays the current configuration in a structured format
+        
+        The lines are collected first and written with a single call.
         """
-        print("\n🔧 Loaded configuration:")
-        self._display_dict(self.config)
-        print()
+        lines = ["\n🔧 Loaded configuration:"]
+        self._display_dict(self.config, lines=lines)
+        lines.append("")
+        print("\n".join(lines))
         
-    def _display_dict(self, data: Dict, indent: int = 1):
+    def _display_dict(self, data: Dict, indent: int = 1, lines: Optional[List[str]] = None) -> List[str]:
         """
-        Displays a dictionary in a structured format
+        Formats a dictionary in a structured format
         
         Args:
             data: Dictionary to display
             indent: Indentation level
+            lines: List the formatted lines are appended to (a new one if not specified)
+            
+        Returns:
+            List[str]: The formatted lines
         """
+        if lines is None:
+            lines = []
+        
         for key, value in data.items():
             # Hide passwords and sensitive values (actual values are used internally)
             if "password" in key.lower() or "pass" in key.lower():
@@ -711,13 +1048,15 @@ class YAMLConfig:
                 # Keep host visible as it is not sensitive
                 display_value = value
             elif isinstance(value, dict):
-                print(f"{'   ' * indent}- {key}:")
-                self._display_dict(value, indent + 1)
+                lines.append(f"{'   ' * indent}- {key}:")
+                self._display_dict(value, indent + 1, lines)
                 continue
             else:
                 display_value = value
                 
-            print(f"{'   ' * indent}- {key}: {display_value}")
+            lines.append(f"{'   ' * indent}- {key}: {display_value}")
+        
+        return lines
             
     def get_wp_memory_limit(self) -> str:
         """
@@ -755,6 +1094,7 @@ class YAMLConfig:
             return
             
         self._update_dict_recursive(self.config, config)
+        self.invalidate_snapshot()
 
 # Global function to get the configuration
 _config_instance = None
@@ -776,6 +1116,18 @@ def get_yaml_config(verbose=False):
         
     return _config_instance
 
+def _clear_config_cache():
+    """
+    Discards the configuration instance and the parsed YAML files,
+    so the next get_yaml_config() call reads the configuration again
+    """
+    global _config_instance
+    
+    _config_instance = None
+    _YAML_CACHE.clear()
+
+get_yaml_config.cache_clear = _clear_config_cache
+
 def get_nested(config_or_dict: Any, section: str, key: str, default: Any = None) -> Any:
     """
     Accesses a value in a nested configuration
@@ -794,11 +1146,4 @@ def get_nested(config_or_dict: Any, section: str, key: str, default: Any = None)
         return config_or_dict.get(section, key, default=default)
         
     # If it is a dictionary, access directly
-    if not isinstance(config_or_dict, dict) or section not in config_or_dict:
-        return default
-        
-    section_dict = config_or_dict[section]
-    if not isinstance(section_dict, dict) or key not in section_dict:
-        return default
-        
-    return section_dict[key] 
\ No newline at end of file
+    return _lookup(config_or_dict, (section, key), default)
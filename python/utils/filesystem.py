@@ -17,6 +17,121 @@ def ensure_dir_exists(directory: Path) -> None:
     """
     directory.mkdir(parents=True, exist_ok=True)
     
+def get_cache_dir() -> Path:
+    """
+    Gets the directory where wp_chariot keeps its cache files
+    
+    Uses $XDG_CACHE_HOME/wp_chariot if defined, otherwise ~/.cache/wp_chariot
+    
+    Returns:
+        Path: Cache directory (created if it doesn't exist)
+    """
+    base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = Path(base_dir) / "wp_chariot"
+    ensure_dir_exists(cache_dir)
+    return cache_dir
+    
+def _stat_exists(path: Any) -> bool:
+    """
+    Checks the existence of a path with a single stat call
+    
+    Args:
+        path: Path to check (str or Path)
+        
+    Returns:
+        bool: True if the path exists
+    """
+    try:
+        os.stat(path)
+        return True
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    except OSError:
+        # Exists but can't be inspected (e.g. permissions)
+        return True
+
+def batch_exists(paths: List[Any]) -> Dict[Any, bool]:
+    """
+    Checks the existence of several paths at once
+    
+    Paths are grouped by parent directory: a directory holding several
+    of them is read once with scandir and the names are looked up in
+    memory, a path alone in its directory is checked with a single stat
+    call. Repeated paths are only checked once.
+    
+    Args:
+        paths: Paths to check (str or Path)
+        
+    Returns:
+        Dict[Any, bool]: Existence of each path, keyed by the given path
+    """
+    by_parent = {}
+    for path in paths:
+        parent, name = os.path.split(os.path.abspath(path))
+        by_parent.setdefault(parent, {}).setdefault(name, []).append(path)
+    
+    results = {}
+    for parent, names in by_parent.items():
+        if len(names) == 1:
+            name, same_paths = next(iter(names.items()))
+            exists = _stat_exists(same_paths[0])
+            for path in same_paths:
+                results[path] = exists
+            continue
+        
+        try:
+            with os.scandir(parent) as entries:
+                # Symlinks are resolved with stat, like os.path.exists does
+                present = {entry.name: not entry.is_symlink() or _stat_exists(entry.path)
+                           for entry in entries if entry.name in names}
+        except (FileNotFoundError, NotADirectoryError):
+            present = {}
+        except OSError:
+            # The directory can't be listed (e.g. permissions), check each path
+            present = {name: _stat_exists(same_paths[0]) for name, same_paths in names.items()}
+        
+        for name, same_paths in names.items():
+            for path in same_paths:
+                results[path] = present.get(name, False)
+    return results
+    
+# Filesystem types reported in /proc/mounts for network mounts
+NETWORK_FS_TYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "ceph", "glusterfs",
+    "fuse.sshfs", "fuse.glusterfs", "fuse.ceph", "afs",
+})
+
+def is_network_filesystem(path: Any) -> bool:
+    """
+    Checks whether a path lives on a network mount (NFS, SMB, sshfs...)
+    
+    Looks up the mount point of the path in /proc/mounts; on systems
+    without it the path is assumed to be local.
+    
+    Args:
+        path: Path to check (str or Path)
+        
+    Returns:
+        bool: True if the path is on a network filesystem
+    """
+    real_path = os.path.realpath(path)
+    mount_point, fs_type = "", ""
+    try:
+        with open("/proc/mounts") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                # Spaces in mount points are escaped as \040
+                point = fields[1].replace("\\040", " ")
+                if len(point) < len(mount_point):
+                    continue
+                if real_path == point or real_path.startswith(point.rstrip("/") + "/"):
+                    mount_point, fs_type = point, fields[2]
+    except OSError:
+        return False
+    return fs_type in NETWORK_FS_TYPES
+    
 def create_backup(file_path: Path, backup_suffix: str = ".bak", config=None) -> Optional[Path]:
     """
     Creates a backup of a file or directory
@@ -3,7 +3,6 @@ Utilities for SSH operations with remote servers
 """
 
 import os
-import paramiko
 from pathlib import Path
 from typing import Optional, List, Tuple, Dict, Any
 import subprocess
@@ -32,6 +31,9 @@ class SSHClient:
             bool: True if the connection was successful, False otherwise
         """
         try:
+            # paramiko is only needed once a connection is opened
+            import paramiko
+            
             self.client = paramiko.SSHClient()
             self.client.load_system_host_keys()
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
@@ -18,15 +18,58 @@ import os
 import subprocess
 import json
 import shlex
+import tempfile
+import shutil
+import functools
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple, Union, Literal
-import yaml
+from typing import Dict, List, Any, Optional, Tuple, Union, Literal, NamedTuple
 
 from config_yaml import get_yaml_config, get_nested
 
 # WP-CLI path configuration - this could be moved to sites.yaml in the future
 WP_CLI_PATH = "/usr/local/bin/wp"
 
+# OpenSSH connection multiplexing for remote WP-CLI calls: the first call opens
+# a master connection that the following calls reuse for 60 seconds. %C is a
+# hash of the connection, which keeps the socket path under the Unix length limit
+SSH_MULTIPLEX_OPTIONS = [
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPath=~/.ssh/cm-%C",
+    "-o", "ControlPersist=60s",
+]
+
+class WPContext(NamedTuple):
+    """
+    Common arguments of the WP-CLI helpers, in their positional order
+    
+    Build it once and pass it unpacked to avoid repeating the same arguments
+    in every call, e.g. is_plugin_active(slug, *ctx).
+    """
+    path: Union[str, Path]
+    remote: bool = False
+    remote_host: Optional[str] = None
+    remote_path: Optional[str] = None
+    use_ddev: bool = True
+    wp_path: Optional[str] = None
+    memory_limit: Optional[str] = None
+
+@functools.lru_cache(maxsize=None)
+def resolve_executable(name: str) -> str:
+    """
+    Resolves the absolute path of an executable once per process
+    
+    Avoids searching PATH again on every subprocess call. If the
+    executable is not found, the name is returned as is so that the
+    error is reported when the command is executed.
+    
+    Args:
+        name: Name of the executable (e.g. "ddev", "ssh", "wp")
+        
+    Returns:
+        str: Absolute path of the executable, or the name if not found
+    """
+    return shutil.which(name) or name
+
 def _format_wp_command(command: List[str]) -> str:
     """
     Formats a command list for safe execution in shell
@@ -39,32 +82,215 @@ def _format_wp_command(command: List[str]) -> str:
     """
     return " ".join([f"'{arg}'" if ' ' in arg else arg for arg in command])
 
-def _execute_ddev_command(command: List[str], path: Union[str, Path], wp_path: Optional[str] = None, 
-                         memory_limit: str = "512M") -> Tuple[int, str, str]:
+def _php_string(value: Any) -> str:
     """
-    Executes a WP-CLI command using DDEV
+    Formats a value as a single-quoted PHP string literal
     
-    Follows the "fail fast" principle: if we cannot execute the command correctly, we fail
-    explicitly instead of guessing paths or parameters.
+    Args:
+        value: Value to format
+        
+    Returns:
+        str: PHP string literal
+    """
+    text = str(value)
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+def _shell_arg(value: str, remote: bool, use_ddev: bool) -> str:
+    """
+    Quotes an argument for the WP-CLI commands that are executed through a shell
+    
+    DDEV and SSH commands are passed to a shell as a single string, while
+    direct commands receive their arguments unchanged.
+    
+    Args:
+        value: Argument to quote
+        remote: If True, the command runs on the remote server
+        use_ddev: If True, the command runs inside DDEV
+        
+    Returns:
+        str: Argument ready to be added to the command list
+    """
+    if remote or use_ddev:
+        return shlex.quote(value)
+    return value
+
+# DDEV shell session in use, if any (see Session)
+_active_session = None
+
+class Session:
+    """
+    Keeps a single 'ddev exec bash' shell open to run several WP-CLI commands
+    
+    Each 'ddev exec' starts a new ddev process and a new exec into the
+    container. While a session is active, the WP-CLI commands executed with
+    DDEV for the same directory are written to one shell instead, and their
+    output is read back until an end marker. If the shell cannot be started
+    or stops responding, commands fall back to a regular 'ddev exec'.
     
-    IMPORTANT: wp_path is mandatory and must be obtained from sites.yaml.
+    Usage:
+        with Session(path):
+            run_wp_cli([...], path, use_ddev=True, wp_path=wp_path)
+    """
+    
+    _MARKER = "__WP_CHARIOT_END__"
+    
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initializes the session
+        
+        Args:
+            path: Project directory where the ddev commands are executed
+        """
+        self.path = str(path)
+        self.process = None
+        self._previous = None
+        # Created with mktemp inside the container when the shell starts
+        self._stderr_file = None
+        
+    def __enter__(self):
+        global _active_session
+        
+        try:
+            self.process = subprocess.Popen(
+                [resolve_executable("ddev"), "exec", "bash"],
+                cwd=self.path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            self._stderr_file = self._create_stderr_file()
+        except Exception:
+            self._stderr_file = None
+            
+        if self._stderr_file is None:
+            # Without a session, commands are executed one by one
+            self.close()
+            
+        self._previous = _active_session
+        _active_session = self
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _active_session
+        
+        _active_session = self._previous
+        self.close()
+        
+    def close(self):
+        """
+        Closes the shell of the session
+        """
+        if not self.process:
+            return
+            
+        try:
+            if self._stderr_file:
+                self.process.stdin.write(f"rm -f {shlex.quote(self._stderr_file)}\n")
+            self.process.stdin.write("exit\n")
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except Exception:
+            self.process.kill()
+        self.process = None
+        self._stderr_file = None
+        
+    def _create_stderr_file(self) -> Optional[str]:
+        """
+        Creates the file that collects the standard error of each command
+        
+        The file is created with mktemp inside the container, so its name is
+        unique and unpredictable for other users of the same container.
+        
+        Returns:
+            Optional[str]: Path of the file inside the container, or None if it could not be created
+        """
+        marker = self._MARKER
+        self.process.stdin.write(f"printf '\\n{marker}:%s\\n' \"$(mktemp)\"\n")
+        self.process.stdin.flush()
+        
+        result = self._read_until(f"{marker}:")
+        if result is None:
+            return None
+        return result[1].split(":", 1)[1] or None
+        
+    def _read_until(self, prefix: str) -> Optional[Tuple[str, str]]:
+        """
+        Reads the shell output up to the line that starts with prefix
+        
+        Returns:
+            Optional[Tuple[str, str]]: Output before the marker line and the
+                                       marker line, or None if the shell ended
+        """
+        lines = []
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                return None
+            if line.startswith(prefix):
+                # Drop the newline printed before the marker
+                return "".join(lines)[:-1], line.rstrip("\n")
+            lines.append(line)
+        
+    def run(self, shell_command: str) -> Optional[Tuple[int, str, str]]:
+        """
+        Executes a shell command inside the session
+        
+        Args:
+            shell_command: Command to execute inside the container
+            
+        Returns:
+            Optional[Tuple[int, str, str]]: Exit code, standard output, standard error,
+                                            or None if the session is not usable
+        """
+        if not self.process or self.process.poll() is not None:
+            return None
+            
+        marker = self._MARKER
+        stderr_file = shlex.quote(self._stderr_file)
+        script = (
+            f"( {shell_command} ) </dev/null 2>{stderr_file}; "
+            f"printf '\\n{marker}:%s\\n' $?; "
+            f"cat {stderr_file}; "
+            f"printf '\\n{marker}\\n'\n"
+        )
+        
+        try:
+            self.process.stdin.write(script)
+            self.process.stdin.flush()
+            
+            result = self._read_until(f"{marker}:")
+            if result is None:
+                self.close()
+                return None
+            stdout, status_line = result
+            
+            result = self._read_until(marker)
+            if result is None:
+                self.close()
+                return None
+            stderr = result[0]
+            
+            return int(status_line.split(":", 1)[1]), stdout, stderr
+        except Exception:
+            self.close()
+            return None
+
+def _ddev_exec_command(command: List[str], wp_path: str, memory_limit: Optional[str]) -> str:
+    """
+    Builds the shell command that runs WP-CLI inside the DDEV container
     
     Args:
         command: List with the command and its arguments
-        path: Path to the directory where to execute the ddev command (project directory)
-        wp_path: Path inside the DDEV container where WordPress is located (MANDATORY)
+        wp_path: Path inside the DDEV container where WordPress is located
         memory_limit: Memory limit for PHP
         
     Returns:
-        Tuple[int, str, str]: Exit code, standard output, standard error
+        str: Command for 'ddev exec'
     """
     # Format the base wp-cli command
     wp_cmd = " ".join(command)
     
-    # If there is no wp_path, fail explicitly
-    if not wp_path:
-        return 1, "", "Error: WordPress path inside the container (wp_path) was not specified. It must be obtained from sites.yaml."
-    
     # Build the complete command using the specified wp_path
     exec_cmd = f"cd {wp_path} && "
     
@@ -74,94 +300,154 @@ def _execute_ddev_command(command: List[str], path: Union[str, Path], wp_path: O
     else:
         exec_cmd += f"{WP_CLI_PATH} {wp_cmd}"
     
-    try:
-        # Execute the command in DDEV and return results directly
-        # Execute in the directory specified in path
-        result = subprocess.run(
-            ["ddev", "exec", exec_cmd],
-            cwd=str(path),  # Important: execute in this directory
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        return result.returncode, result.stdout, result.stderr
-    except Exception as e:
-        # If there's an error in execution, report immediately
-        return 1, "", f"Error executing DDEV command: {str(e)}"
+    return exec_cmd
 
-def _execute_direct_command(command: List[str], path: Union[str, Path], 
-                           memory_limit: str = "512M") -> Tuple[int, str, str]:
+def _ssh_command(command: List[str], remote_host: str, remote_path: str,
+                 memory_limit: str) -> List[str]:
     """
-    Executes a WP-CLI command directly (without DDEV)
+    Builds the ssh command that runs WP-CLI on the remote server
     
     Args:
         command: List with the command and its arguments
-        path: Path to the WordPress directory
+        remote_host: Remote host
+        remote_path: Remote path
         memory_limit: Memory limit for PHP
         
     Returns:
-        Tuple[int, str, str]: Exit code, standard output, standard error
+        List[str]: Arguments for subprocess
+    """
+    # Add the memory limit to PHP commands
+    php_memory_cmd = f"php -d memory_limit={memory_limit}"
+    return [resolve_executable("ssh")] + SSH_MULTIPLEX_OPTIONS + [remote_host, f"cd {remote_path} && {php_memory_cmd} $(which wp) {' '.join(command)}"]
+
+def _wp_cli_process(command: List[str], path: Union[str, Path], remote: bool,
+                    remote_host: Optional[str], remote_path: Optional[str], use_ddev: bool,
+                    wp_path: Optional[str], memory_limit: Optional[str]
+                    ) -> Tuple[List[str], Optional[str], Optional[Dict[str, str]]]:
     """
-    wp_cmd = ["wp"] + command
+    Builds the process that runs a WP-CLI command in its environment
     
-    try:
-        # Try to configure the environment with the memory limit
-        env = os.environ.copy()
-        env["PHP_MEMORY_LIMIT"] = memory_limit
+    Follows the "fail fast" principle: if we cannot execute the command correctly, we fail
+    explicitly instead of guessing paths or parameters.
+    
+    Args:
+        command: List with the command and its arguments
+        path: Path to the WordPress directory on the host (project directory)
+        remote: If True, the command runs on the remote server via SSH
+        remote_host: Remote host (only if remote=True)
+        remote_path: Remote path (only if remote=True)
+        use_ddev: If True, the command runs inside the DDEV container
+        wp_path: Path inside the DDEV container where WordPress is located
+                (REQUIRED if use_ddev=True, obtained from sites.yaml)
+        memory_limit: Memory limit for PHP (if None, uses the configuration value)
         
-        result = subprocess.run(
-            wp_cmd,
-            cwd=str(path),
-            capture_output=True,
-            text=True,
-            check=False,
-            env=env
-        )
-        return result.returncode, result.stdout, result.stderr
-    except Exception as e:
-        return 1, "", str(e)
+    Returns:
+        Tuple[List[str], Optional[str], Optional[Dict[str, str]]]: Arguments, working
+        directory and environment for subprocess (for DDEV, the last argument is the
+        shell command given to 'ddev exec')
+        
+    Raises:
+        ValueError: If the configuration needed for the environment is missing
+    """
+    # If memory limit is not specified, use the configuration value
+    if memory_limit is None:
+        memory_limit = get_yaml_config().get_wp_memory_limit()
+    
+    if remote:
+        # Remote command via SSH
+        if not remote_host or not remote_path:
+            raise ValueError("Remote host and path are required to execute WP-CLI on the server")
+        return _ssh_command(command, remote_host, remote_path, memory_limit), None, None
+    
+    if use_ddev:
+        # Local command using DDEV - wp_path is mandatory
+        if not wp_path:
+            # Explicitly fail without wp_path
+            raise ValueError("Error: wp_path (path inside the DDEV container) was not specified. It must be obtained from sites.yaml.")
+        return [resolve_executable("ddev"), "exec", _ddev_exec_command(command, wp_path, memory_limit)], str(path), None
+    
+    # Direct command without DDEV, configuring the environment with the memory limit
+    env = os.environ.copy()
+    env["PHP_MEMORY_LIMIT"] = memory_limit
+    return [resolve_executable("wp")] + command, str(path), env
 
-def _execute_ssh_command(command: List[str], remote_host: str, remote_path: str, 
-                        memory_limit: str = "512M") -> Tuple[int, str, str]:
+def _session_for(path: Union[str, Path], remote: bool, use_ddev: bool) -> Optional[Session]:
     """
-    Executes a WP-CLI command on a remote server via SSH
+    Gets the active DDEV session that can run commands for a directory
+    
+    Returns:
+        Optional[Session]: The active session, or None if commands must start their own process
+    """
+    session = _active_session
+    if remote or not use_ddev or session is None or session.path != str(path):
+        return None
+    return session
+
+def run_wp_cli(command: List[str], path: Union[str, Path], remote: bool = False, 
+              remote_host: Optional[str] = None, remote_path: Optional[str] = None,
+              use_ddev: bool = True, wp_path: Optional[str] = None,
+              memory_limit: Optional[str] = None, check_only: bool = False) -> Tuple[int, str, str]:
+    """
+    Executes a WP-CLI command
+    
+    IMPORTANT: For DDEV commands (use_ddev=True), wp_path is MANDATORY and 
+    must be obtained from sites.yaml.
     
     Args:
         command: List with the command and its arguments
-        remote_host: Remote host
-        remote_path: Remote path
-        memory_limit: Memory limit for PHP
+        path: Path to the WordPress directory on the host (project directory)
+        remote: If True, executes the command on the remote server
+        remote_host: Remote host (only if remote=True)
+        remote_path: Remote path (only if remote=True)
+        use_ddev: If True (default), uses ddev in local environment
+        wp_path: Path inside the DDEV container where WordPress is located
+                (REQUIRED if use_ddev=True, obtained from sites.yaml)
+        memory_limit: Memory limit for PHP (if None, uses the configuration value)
+        check_only: If True, the standard output is discarded instead of captured,
+                for commands that only report through their exit code
         
     Returns:
         Tuple[int, str, str]: Exit code, standard output, standard error
     """
-    if not remote_host or not remote_path:
-        return 1, "", "Remote host and path are required to execute WP-CLI on the server"
-        
-    # Add the memory limit to PHP commands
-    php_memory_cmd = f"php -d memory_limit={memory_limit}"
-    ssh_cmd = ["ssh", remote_host, f"cd {remote_path} && {php_memory_cmd} $(which wp) {' '.join(command)}"]
+    try:
+        args, cwd, env = _wp_cli_process(command, path, remote, remote_host, remote_path,
+                                         use_ddev, wp_path, memory_limit)
+    except ValueError as e:
+        return 1, "", str(e)
+    
+    # Reuse the open DDEV shell if a session is active for this directory
+    session = _session_for(path, remote, use_ddev)
+    if session is not None:
+        result = session.run(args[-1])
+        if result is not None:
+            return result
     
     try:
         result = subprocess.run(
-            ssh_cmd,
-            capture_output=True,
+            args,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.DEVNULL if check_only else subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
             check=False
         )
-        return result.returncode, result.stdout, result.stderr
+        return result.returncode, result.stdout or "", result.stderr
     except Exception as e:
-        return 1, "", str(e)
+        # If there's an error in execution, report immediately
+        return 1, "", f"Error executing WP-CLI command: {str(e)}"
 
-def run_wp_cli(command: List[str], path: Union[str, Path], remote: bool = False, 
-              remote_host: Optional[str] = None, remote_path: Optional[str] = None,
-              use_ddev: bool = True, wp_path: Optional[str] = None,
-              memory_limit: Optional[str] = None) -> Tuple[int, str, str]:
+def run_wp_cli_line(command: List[str], path: Union[str, Path], remote: bool = False, 
+                   remote_host: Optional[str] = None, remote_path: Optional[str] = None,
+                   use_ddev: bool = True, wp_path: Optional[str] = None,
+                   memory_limit: Optional[str] = None) -> Tuple[int, str, str]:
     """
-    Executes a WP-CLI command
+    Executes a WP-CLI command whose result is its last line of output
     
-    IMPORTANT: For DDEV commands (use_ddev=True), wp_path is MANDATORY and 
-    must be obtained from sites.yaml.
+    Reads the output line by line while the command runs and keeps only the
+    last non-empty line, instead of collecting the whole output to split it
+    afterwards. Useful for commands that print a single value or JSON document,
+    possibly preceded by PHP warnings.
     
     Args:
         command: List with the command and its arguments
@@ -175,31 +461,36 @@ def run_wp_cli(command: List[str], path: Union[str, Path], remote: bool = False,
         memory_limit: Memory limit for PHP (if None, uses the configuration value)
         
     Returns:
-        Tuple[int, str, str]: Exit code, standard output, standard error
+        Tuple[int, str, str]: Exit code, last non-empty line of the output, standard error
     """
-    # Get configuration and memory value
-    config = get_yaml_config()
+    try:
+        args, cwd, env = _wp_cli_process(command, path, remote, remote_host, remote_path,
+                                         use_ddev, wp_path, memory_limit)
+    except ValueError as e:
+        return 1, "", str(e)
     
-    # If memory limit is not specified, use the configuration value
-    if memory_limit is None:
-        memory_limit = config.get_wp_memory_limit()
+    # Commands inside an active DDEV session already have their output in memory
+    session = _session_for(path, remote, use_ddev)
+    if session is not None:
+        result = session.run(args[-1])
+        if result is not None:
+            code, stdout, stderr = result
+            lines = [line for line in stdout.splitlines() if line.strip()]
+            return code, lines[-1] if lines else "", stderr
     
-    # Execute command according to the environment
-    if remote:
-        # Remote command via SSH
-        if not remote_host or not remote_path:
-            return 1, "", "Remote host and path are required to execute WP-CLI on the server"
-        return _execute_ssh_command(command, remote_host, remote_path, memory_limit)
-    elif use_ddev:
-        # Local command using DDEV - wp_path is mandatory
-        if not wp_path:
-            # Explicitly fail without wp_path
-            return 1, "", "Error: wp_path (path inside the DDEV container) was not specified. It must be obtained from sites.yaml."
-        
-        return _execute_ddev_command(command, path, wp_path, memory_limit)
-    else:
-        # Direct command without DDEV
-        return _execute_direct_command(command, path, memory_limit)
+    try:
+        # stderr goes to a temporary file so it can't block the stdout pipe
+        with tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(args, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=stderr_file) as process:
+                last_line = b""
+                for line in process.stdout:
+                    if line.strip():
+                        last_line = line
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+        return process.returncode, last_line.rstrip(b"\r\n").decode(errors="replace"), stderr
+    except Exception as e:
+        return 1, "", str(e)
 
 def is_plugin_installed(plugin_slug: str, path: Union[str, Path], remote: bool = False,
                        remote_host: Optional[str] = None, remote_path: Optional[str] = None,
@@ -311,6 +602,44 @@ def install_plugin(plugin_slug: str, path: Union[str, Path], remote: bool = Fals
     
     return False
 
+def ensure_plugin(plugin_slug: str, path: Union[str, Path], remote: bool = False,
+                  remote_host: Optional[str] = None, remote_path: Optional[str] = None,
+                  use_ddev: bool = True, wp_path: Optional[str] = None,
+                  memory_limit: Optional[str] = None, force: bool = False) -> bool:
+    """
+    Installs and activates a WordPress plugin with a single WP-CLI call
+    
+    Uses 'wp plugin install <slug> --activate', which skips the download if
+    the plugin is already installed and activates it in the same bootstrap,
+    instead of checking, installing and activating with separate calls.
+    
+    Args:
+        plugin_slug: Plugin slug or URL of the plugin ZIP
+        path: Path to the WordPress directory
+        remote: If True, installs on the remote server
+        remote_host: Remote host (only if remote=True)
+        remote_path: Remote path (only if remote=True)
+        use_ddev: If True (default), uses ddev in local environment
+        wp_path: Specific WordPress path inside the container (optional)
+        memory_limit: Memory limit for PHP (optional)
+        force: If True, reinstalls the plugin even if it is already installed
+        
+    Returns:
+        bool: True if the plugin is installed and active, False otherwise
+    """
+    cmd = ["plugin", "install", plugin_slug, "--activate"]
+    
+    if force:
+        cmd.append("--force")
+    
+    code, stdout, stderr = run_wp_cli(cmd, path, remote, remote_host, remote_path, use_ddev, wp_path, memory_limit)
+    
+    if code != 0:
+        print(f"Error installing the plugin: {stderr}")
+        return False
+    
+    return True
+
 def activate_plugin(plugin_slug: str, path: Union[str, Path], remote: bool = False,
                    remote_host: Optional[str] = None, remote_path: Optional[str] = None,
                    use_ddev: bool = True, wp_path: Optional[str] = None,
@@ -647,6 +976,96 @@ def update_option(option_name: str, option_value: str, path: Union[str, Path],
     print(f"✅ Option {option_name} updated correctly")
     return True
 
+def get_options_bulk(option_names: List[str], path: Union[str, Path], remote: bool = False,
+                     remote_host: Optional[str] = None, remote_path: Optional[str] = None,
+                     use_ddev: bool = True, wp_path: Optional[str] = None,
+                     memory_limit: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Gets several WordPress options with a single WP-CLI call
+    
+    Each 'wp option get' boots WordPress once, so the options are read
+    together with one 'wp eval' that prints them as JSON.
+    
+    Args:
+        option_names: Names of the options to read
+        path: Path to the WordPress directory
+        remote: If True, executes the command on the remote server
+        remote_host: Remote host (only if remote=True)
+        remote_path: Remote path (only if remote=True)
+        use_ddev: If True (default), uses ddev in local environment
+        wp_path: Specific WordPress path inside the container (optional)
+        memory_limit: Memory limit for PHP (optional)
+        
+    Returns:
+        Optional[Dict[str, Any]]: Option values by name (None for options that
+                                  don't exist), or None if the command failed
+    """
+    pairs = ",".join(f"{_php_string(name)}=>get_option({_php_string(name)})" for name in option_names)
+    php_code = f"echo json_encode([{pairs}]);"
+    cmd = ["eval", _shell_arg(php_code, remote, use_ddev), "--skip-themes", "--skip-plugins"]
+    
+    # The JSON is the last line; PHP warnings (e.g. memory limit) may precede it
+    code, line, stderr = run_wp_cli_line(cmd, path, remote, remote_host, remote_path, use_ddev, wp_path, memory_limit)
+    
+    if code != 0 or not line:
+        return None
+        
+    try:
+        values = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+        
+    if not isinstance(values, dict):
+        return None
+        
+    # get_option() returns false for options that don't exist
+    return {name: None if values.get(name) is False else values.get(name) for name in option_names}
+
+def update_options_bulk(options: Dict[str, Any], path: Union[str, Path], remote: bool = False,
+                        remote_host: Optional[str] = None, remote_path: Optional[str] = None,
+                        use_ddev: bool = True, wp_path: Optional[str] = None,
+                        memory_limit: Optional[str] = None, flush: bool = False) -> bool:
+    """
+    Updates several WordPress options with a single WP-CLI call
+    
+    All update_option() calls (and optionally the cache flush) run inside one
+    'wp eval', so WordPress is booted once instead of once per option.
+    
+    Args:
+        options: Option values by name
+        path: Path to the WordPress directory
+        remote: If True, executes the command on the remote server
+        remote_host: Remote host (only if remote=True)
+        remote_path: Remote path (only if remote=True)
+        use_ddev: If True (default), uses ddev in local environment
+        wp_path: Specific WordPress path inside the container (optional)
+        memory_limit: Memory limit for PHP (optional)
+        flush: If True, also flushes the WordPress cache
+        
+    Returns:
+        bool: True if it was updated correctly, False otherwise
+    """
+    statements = [f"update_option({_php_string(name)},{_php_string(value)});" for name, value in options.items()]
+    if flush:
+        statements.append("wp_cache_flush();")
+        
+    if not statements:
+        return True
+        
+    cmd = ["eval", _shell_arg("".join(statements), remote, use_ddev)]
+    
+    code, stdout, stderr = run_wp_cli(cmd, path, remote, remote_host, remote_path, use_ddev, wp_path, memory_limit)
+    
+    if code != 0:
+        print(f"⚠️ Error updating options {', '.join(options)}: {stderr}")
+        return False
+        
+    for name in options:
+        print(f"✅ Option {name} updated correctly")
+    if flush:
+        print("✅ WordPress cache flushed correctly")
+    return True
+
 def update_media_path(new_path: str, path: Union[str, Path], 
                      remote: bool = False, remote_host: Optional[str] = None, 
                      remote_path: Optional[str] = None, use_ddev: bool = True,
@@ -721,7 +1140,8 @@ def is_wordpress_installed(path: Union[str, Path], remote: bool = False,
         remote_path=remote_path,
         use_ddev=use_ddev, 
         wp_path=wp_path,
-        memory_limit=memory_limit
+        memory_limit=memory_limit,
+        check_only=True
     )
     
     # Return result directly without further processing
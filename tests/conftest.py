@@ -0,0 +1,44 @@
+"""
+Shared fixtures for the wp_chariot tests
+"""
+
+import os
+import sys
+
+import pytest
+
+# The modules are imported the same way cli.py does, from the python directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "python"))
+
+
+class FakeConfig:
+    """
+    Minimal stand-in for YAMLConfig with a fixed ssh.local_path
+    """
+    
+    def __init__(self, local_path):
+        self.local_path = str(local_path)
+    
+    def get(self, *path, default=None):
+        if path == ("ssh", "local_path"):
+            return self.local_path
+        return default
+    
+    def get_default_site(self):
+        return "test"
+    
+    def select_site(self, site_alias=None):
+        return True
+
+
+@pytest.fixture
+def site_dir(tmp_path, monkeypatch):
+    """
+    Creates an empty site directory and points the backup module's configuration to it
+    """
+    import commands.backup
+    
+    local_path = tmp_path / "site" / "app" / "public"
+    local_path.mkdir(parents=True)
+    monkeypatch.setattr(commands.backup, "get_yaml_config", lambda: FakeConfig(local_path))
+    return local_path
@@ -0,0 +1,150 @@
+"""
+Tests for the full backup command
+"""
+
+import os
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+import commands.backup
+from commands.backup import ZIP_CODECS, create_full_backup
+
+
+def _long_relative_path():
+    # Over 255 characters, which no ustar header can hold
+    return "/".join(["wp-content", "uploads"] + ["d" * 60] * 4 + ["f" * 60 + ".php"])
+
+
+@pytest.mark.parametrize("backend", ["libarchive", "tarfile"])
+def test_tar_zst_stores_paths_longer_than_255_chars(site_dir, tmp_path, monkeypatch, backend):
+    zstandard = pytest.importorskip("zstandard")
+    if backend == "libarchive":
+        pytest.importorskip("libarchive")
+    else:
+        # Make the libarchive import fail so the tarfile writer is used
+        monkeypatch.setitem(sys.modules, "libarchive", None)
+    
+    rel_path = _long_relative_path()
+    assert len(rel_path) > 255
+    file_path = site_dir / rel_path
+    file_path.parent.mkdir(parents=True)
+    file_path.write_bytes(b"<?php echo 'deep';")
+    
+    backup_path = create_full_backup(output_dir=str(tmp_path / "out"), archive_format="tar.zst")
+    
+    with open(backup_path, "rb") as f, \
+            zstandard.ZstdDecompressor().stream_reader(f) as stream, \
+            tarfile.open(fileobj=stream, mode="r|") as tar:
+        contents = {member.name: tar.extractfile(member).read() for member in tar if member.isfile()}
+    
+    assert contents == {rel_path: b"<?php echo 'deep';"}
+
+
+def test_unreadable_entries_are_skipped(site_dir, tmp_path, monkeypatch, capsys):
+    (site_dir / "index.php").write_bytes(b"<?php")
+    locked = site_dir / "locked"
+    locked.mkdir()
+    (locked / "secret.php").write_bytes(b"<?php")
+    
+    real_scandir = os.scandir
+    
+    def scandir(path):
+        if os.fspath(path) == str(locked):
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+    
+    monkeypatch.setattr(os, "scandir", scandir)
+    
+    backup_path = create_full_backup(output_dir=str(tmp_path / "out"))
+    
+    with zipfile.ZipFile(backup_path) as zipf:
+        assert zipf.namelist() == ["index.php"]
+    assert "Skipping unreadable directory" in capsys.readouterr().out
+
+
+def _mixed_tree(site_dir):
+    """
+    Creates files that take every write path: tiny, already compressed,
+    compressed in the pool and streamed (large)
+    """
+    files = {
+        "index.php": b"<?php",
+        "wp-content/uploads/photo.jpg": os.urandom(4096),
+        "wp-content/themes/theme/style.css": b"body { margin: 0; }\n" * 500,
+        "wp-content/themes/theme/functions.php": b"<?php // functions\n" * 200,
+        "wp-content/uploads/export.sql": b"INSERT INTO wp_posts VALUES (1);\n" * 2000,
+        "wp-content/empty.txt": b"",
+    }
+    for rel_path, data in files.items():
+        path = site_dir / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return files
+
+
+@pytest.mark.parametrize("precompress", [True, False])
+@pytest.mark.parametrize("codec", ZIP_CODECS)
+def test_zip_round_trip(site_dir, tmp_path, monkeypatch, codec, precompress):
+    if codec == "zstd" and not hasattr(zipfile, "ZIP_ZSTANDARD"):
+        pytest.skip("zstd ZIP entries require Python 3.14")
+    # Stream the largest file instead of compressing it in memory
+    monkeypatch.setattr(commands.backup, "PARALLEL_MAX_FILE_SIZE", 32 * 1024)
+    if not precompress:
+        monkeypatch.setattr(commands.backup, "_can_write_compressed", lambda zipf: False)
+    files = _mixed_tree(site_dir)
+    
+    backup_path = create_full_backup(output_dir=str(tmp_path / "out"), codec=codec, jobs=2)
+    
+    with zipfile.ZipFile(backup_path) as zipf:
+        assert zipf.testzip() is None
+        assert {name: zipf.read(name) for name in zipf.namelist()} == files
+
+
+@pytest.mark.parametrize("archive_format, codec, backend", [
+    ("zip", "deflate", None),
+    ("zip", "store", None),
+    ("tar.zst", None, "libarchive"),
+    ("tar.zst", None, "tarfile"),
+])
+def test_files_deleted_after_the_scan_are_skipped(site_dir, tmp_path, monkeypatch, capsys,
+                                                  archive_format, codec, backend):
+    if archive_format == "tar.zst":
+        pytest.importorskip("zstandard")
+        if backend == "libarchive":
+            pytest.importorskip("libarchive")
+        else:
+            monkeypatch.setitem(sys.modules, "libarchive", None)
+    files = _mixed_tree(site_dir)
+    vanished = "wp-content/themes/theme/style.css"
+    
+    real_iter_files = commands.backup._iter_files
+    
+    def iter_files(root):
+        # Scanned (and stat'ed) before the file is deleted
+        entries = list(real_iter_files(root))
+        os.unlink(site_dir / vanished)
+        return iter(entries)
+    
+    monkeypatch.setattr(commands.backup, "_iter_files", iter_files)
+    kwargs = {"codec": codec} if codec else {}
+    
+    backup_path = create_full_backup(output_dir=str(tmp_path / "out"), archive_format=archive_format, **kwargs)
+    
+    del files[vanished]
+    if archive_format == "zip":
+        with zipfile.ZipFile(backup_path) as zipf:
+            assert zipf.testzip() is None
+            assert sorted(zipf.namelist()) == sorted(files)
+    else:
+        zstandard = pytest.importorskip("zstandard")
+        with open(backup_path, "rb") as f, \
+                zstandard.ZstdDecompressor().stream_reader(f) as stream, \
+                tarfile.open(fileobj=stream, mode="r|") as tar:
+            assert sorted(member.name for member in tar) == sorted(files)
+    
+    output = capsys.readouterr().out
+    assert f"Skipping {site_dir / vanished}" in output
+    assert f"{len(files)} files" in output
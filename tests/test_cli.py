@@ -0,0 +1,85 @@
+"""
+Tests for the command line interface
+"""
+
+import json
+import os
+import time
+
+from click.testing import CliRunner
+
+import cli
+import commands.database
+import commands.sync
+
+
+class InitConfig:
+    def select_site(self, site=None):
+        return True
+
+
+def test_init_parallel_imports_database_after_files(monkeypatch):
+    events = []
+    
+    def sync_files(**kwargs):
+        events.append("files started")
+        time.sleep(0.1)
+        events.append("files finished")
+        return True
+    
+    def sync_database(before_import=None, **kwargs):
+        events.append("database downloaded")
+        assert before_import()
+        events.append("database imported")
+        return True
+    
+    monkeypatch.setattr(cli, "get_yaml_config", lambda verbose=False: InitConfig())
+    monkeypatch.setattr(commands.sync, "sync_files", sync_files)
+    monkeypatch.setattr(commands.database, "sync_database", sync_database)
+    
+    result = CliRunner().invoke(cli.cli, ["init", "--with-db", "--parallel"])
+    
+    assert result.exit_code == 0, result.output
+    assert events.index("database imported") > events.index("files finished")
+    assert events.index("database downloaded") < events.index("files finished")
+
+
+def test_init_parallel_skips_import_when_files_fail(monkeypatch):
+    imported = []
+    
+    def sync_database(before_import=None, **kwargs):
+        if not before_import():
+            return False
+        imported.append(True)
+        return True
+    
+    monkeypatch.setattr(cli, "get_yaml_config", lambda verbose=False: InitConfig())
+    monkeypatch.setattr(commands.sync, "sync_files", lambda **kwargs: False)
+    monkeypatch.setattr(commands.database, "sync_database", sync_database)
+    
+    result = CliRunner().invoke(cli.cli, ["init", "--with-db", "--parallel"])
+    
+    assert result.exit_code == 1
+    assert not imported
+
+
+class DDEVConfig(InitConfig):
+    current_site = "test"
+    
+    def __init__(self, local_path):
+        self.local_path = str(local_path)
+    
+    def get_ddev_paths(self):
+        project_dir = os.path.dirname(os.path.dirname(self.local_path))
+        return "/var/www/html", "app/public", "/var/www/html/app/public", project_dir
+
+
+def test_verify_wp_json_reports_missing_project_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "get_yaml_config", lambda verbose=False: DDEVConfig(tmp_path / "missing" / "app" / "public"))
+    
+    result = CliRunner().invoke(cli.cli, ["verify-wp", "--json"])
+    
+    assert result.exit_code == 1
+    data = json.loads(result.stdout)
+    assert data["installed"] is False
+    assert "does not exist" in data["error"]
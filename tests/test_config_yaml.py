@@ -0,0 +1,67 @@
+"""
+Tests for the YAML configuration
+"""
+
+import os
+
+import pytest
+
+import config_yaml
+
+
+def _use_snapshot(monkeypatch, path):
+    monkeypatch.setattr(config_yaml, "_SNAPSHOT_PATH", str(path))
+    monkeypatch.setattr(config_yaml, "_snapshot", None)
+
+
+def test_snapshot_round_trip(tmp_path, monkeypatch):
+    snapshot_path = tmp_path / "config-snapshot.marshal"
+    _use_snapshot(monkeypatch, snapshot_path)
+    data = {"ssh": {"local_path": "/srv/site", "port": 22}, "exclusions": ["cache/"]}
+    
+    config_yaml._store_snapshot("/srv/sites.yaml", (1, 2), data)
+    _use_snapshot(monkeypatch, snapshot_path)
+    
+    assert config_yaml._load_snapshot() == {"/srv/sites.yaml": ((1, 2), data)}
+
+
+def test_snapshot_writable_by_others_is_ignored(tmp_path, monkeypatch, capsys):
+    snapshot_path = tmp_path / "config-snapshot.marshal"
+    _use_snapshot(monkeypatch, snapshot_path)
+    config_yaml._store_snapshot("/srv/sites.yaml", (1, 2), {"ssh": {}})
+    os.chmod(snapshot_path, 0o666)
+    _use_snapshot(monkeypatch, snapshot_path)
+    
+    assert config_yaml._load_snapshot() == {}
+    assert "not private" in capsys.readouterr().out
+
+
+def test_parsed_files_are_cached_in_the_cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    _use_snapshot(monkeypatch, "")
+    yaml_file = tmp_path / "sites.yaml"
+    yaml_file.write_text("ssh:\n  local_path: /srv/site\n")
+    st = os.stat(yaml_file)
+    stamp = (st.st_mtime_ns, st.st_size)
+    
+    assert config_yaml._parse_yaml_file(str(yaml_file), stamp) == {"ssh": {"local_path": "/srv/site"}}
+    
+    # Another process finds the parsed content without reading the YAML file
+    yaml_file.unlink()
+    _use_snapshot(monkeypatch, "")
+    assert (tmp_path / "cache" / "wp_chariot" / "config-snapshot.marshal").exists()
+    assert config_yaml._parse_yaml_file(str(yaml_file), stamp) == {"ssh": {"local_path": "/srv/site"}}
+
+
+@pytest.mark.parametrize("local_path, project_dir", [
+    ("/home/user/project/app/public", "/home/user/project"),
+    ("/home/user/project/app/public/", "/home/user/project"),
+    ("app/public", "."),
+    ("public", "."),
+])
+def test_ddev_project_dir_is_two_levels_up(local_path, project_dir):
+    config = config_yaml.YAMLConfig.__new__(config_yaml.YAMLConfig)
+    config.config = {"ssh": {"local_path": local_path}, "ddev": {"base_path": "/var/www/html", "docroot": "app/public"}}
+    config._ddev_paths = None
+    
+    assert config.get_ddev_paths()[3] == project_dir
@@ -0,0 +1,89 @@
+"""
+Tests for the media path configuration
+"""
+
+import pytest
+
+from commands import media
+
+
+class MediaConfig:
+    def __init__(self, local_path):
+        self.sections = {
+            "ssh": {"local_path": str(local_path), "remote_host": "prod", "remote_path": "/srv/www"},
+            "ddev": {"base_path": "/var/www/html", "docroot": "app/public"},
+            "media": {"url": "https://media.example.com"},
+        }
+    
+    def get(self, section):
+        return self.sections.get(section)
+
+
+@pytest.fixture
+def applied(tmp_path, monkeypatch):
+    """
+    Records the calls that would apply the configuration on the remote server
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    calls = []
+    monkeypatch.setattr(media, "_apply_media_configuration", lambda *args: calls.append(args) or True)
+    return calls
+
+
+def _site_values(**overrides):
+    values = {
+        "upload_url_path": "https://media.example.com",
+        "owmp_path": None,
+        "owmp_expert_bool": "0",
+        "active_plugins": ["wp-original-media-path/wp-original-media-path.php"],
+    }
+    values.update(overrides)
+    return values
+
+
+def test_recorded_state_is_skipped_while_site_matches(tmp_path, monkeypatch, applied):
+    config = MediaConfig(tmp_path / "app" / "public")
+    monkeypatch.setattr(media, "get_options_bulk", lambda names, *ctx: _site_values())
+    
+    assert media.configure_media_path(remote=True, config=config)
+    assert media.configure_media_path(remote=True, config=config)
+    
+    assert len(applied) == 1
+
+
+@pytest.mark.parametrize("site_values", [
+    None,
+    _site_values(upload_url_path=""),
+    _site_values(active_plugins=[]),
+])
+def test_recorded_state_is_applied_again_when_site_differs(tmp_path, monkeypatch, applied, site_values):
+    config = MediaConfig(tmp_path / "app" / "public")
+    monkeypatch.setattr(media, "get_options_bulk", lambda names, *ctx: site_values)
+    
+    assert media.configure_media_path(remote=True, config=config)
+    assert media.configure_media_path(remote=True, config=config)
+    
+    assert len(applied) == 2
+
+
+def test_applied_state_is_kept_out_of_the_project(tmp_path, monkeypatch, applied):
+    config = MediaConfig(tmp_path / "app" / "public")
+    monkeypatch.setattr(media, "get_options_bulk", lambda names, *ctx: _site_values())
+    
+    assert media.configure_media_path(remote=True, config=config)
+    
+    assert not (tmp_path / "app").exists()
+    assert list((tmp_path / "cache" / "wp_chariot").glob("media-public-*.state"))
+
+
+def test_failed_option_update_is_not_recorded(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    config = MediaConfig(tmp_path / "app" / "public")
+    monkeypatch.setattr(media, "is_wordpress_installed", lambda *ctx: True)
+    monkeypatch.setattr(media, "ensure_plugin", lambda *args, **kwargs: True)
+    monkeypatch.setattr(media, "update_options_bulk", lambda *args, **kwargs: False)
+    monkeypatch.setattr(media, "get_options_bulk", lambda names, *ctx: _site_values())
+    
+    assert not media.configure_media_path(remote=True, config=config)
+    
+    assert media._read_applied_state(tmp_path / "app" / "public") == {}
@@ -0,0 +1,56 @@
+"""
+Tests for the WP-CLI helpers
+"""
+
+import contextlib
+import os
+
+import pytest
+
+from utils import wp_cli
+
+
+@pytest.fixture
+def fake_ddev(tmp_path, monkeypatch):
+    """
+    Replaces 'ddev exec <command>' with the command run locally, and WP-CLI
+    with a script that prints a PHP warning and its arguments
+    """
+    script = tmp_path / "ddev"
+    script.write_text('#!/bin/sh\nshift\nexec sh -c "$1"\n')
+    script.chmod(0o755)
+    wp = tmp_path / "wp"
+    wp.write_text('#!/bin/sh\necho "PHP Warning: something"\necho\necho "$@"\n')
+    wp.chmod(0o755)
+    monkeypatch.setattr(wp_cli, "resolve_executable", lambda name: str(script))
+    monkeypatch.setattr(wp_cli, "WP_CLI_PATH", str(wp))
+    return script
+
+
+def test_session_stderr_file_is_private_and_removed(fake_ddev, tmp_path):
+    with wp_cli.Session(tmp_path) as session:
+        stderr_file = session._stderr_file
+        assert os.stat(stderr_file).st_mode & 0o077 == 0
+        assert session.run("echo out; echo err >&2; exit 3") == (3, "out\n", "err\n")
+        assert session.run("echo again") == (0, "again\n", "")
+    
+    assert not os.path.exists(stderr_file)
+    assert session.process is None
+
+
+@pytest.mark.parametrize("in_session", [False, True])
+def test_run_wp_cli_and_last_line_share_the_ddev_command(fake_ddev, tmp_path, in_session):
+    args = (["option", "get", "home"], tmp_path)
+    # Without a memory limit the command doesn't go through php
+    kwargs = dict(use_ddev=True, wp_path=str(tmp_path), memory_limit="")
+    
+    with wp_cli.Session(tmp_path) if in_session else contextlib.nullcontext():
+        assert wp_cli.run_wp_cli(*args, **kwargs) == (0, "PHP Warning: something\n\noption get home\n", "")
+        assert wp_cli.run_wp_cli_line(*args, **kwargs) == (0, "option get home", "")
+
+
+def test_missing_wp_path_fails_before_running(fake_ddev, tmp_path):
+    for run in (wp_cli.run_wp_cli, wp_cli.run_wp_cli_line):
+        code, _, stderr = run(["core", "version"], tmp_path, use_ddev=True, memory_limit="256M")
+        assert code == 1
+        assert "wp_path" in stderr